@@ -1,11 +1,37 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
-from pyxlsb import open_workbook
+from flask import Flask, render_template, request, jsonify, send_from_directory, g
+from excel_reader import (describe_workbook, describe_workbook_bytes, find_sheet, load_sheet_grid,
+                          read_excel_range, read_excel_range_bytes)
+from cell_refs import CellRange, MAX_ROWS, parse_cell_reference, parse_cell_references, parse_range
+from metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from compression import choose_encoding, compress
+from assets import AssetManifest
+from file_watcher import FileWatcher
+from werkzeug.http import is_resource_modified
 import pandas as pd
+import numpy as np
 import os
-from werkzeug.utils import secure_filename
 from datetime import datetime, timedelta
 import pytz
 import logging
+import json
+import asyncio
+import hashlib
+import mimetypes
+import sys
+import threading
+import time
+import tempfile
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
@@ -16,175 +42,1241 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 DEFAULT_FILE = os.path.join('certe_fresh', 'Certe Beta 1.2.xlsb')
 DEFAULT_START_CELL = 'G1'
 DEFAULT_END_CELL = 'K5'
+ET = pytz.timezone('America/New_York')
+MAX_BATCH_RANGES = 50
+GAME_FEED_INTERVAL = 5  # seconds between schedule polls for /stream/games
+GAME_STREAM_MAX_SECONDS = 300
+# Off by default: under gthread workers every open /stream/games holds a worker
+# thread, so only enable it behind asgi.py or a gevent worker
+GAME_STREAM = os.environ.get('GAME_STREAM', 'false') == 'true'
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', 2))
+PARSE_QUEUE_LIMIT = int(os.environ.get('PARSE_QUEUE_LIMIT', PARSE_WORKERS * 2))
+PARSE_TIMEOUT = float(os.environ.get('PARSE_TIMEOUT', 30))  # seconds
+PARSE_RETRY_AFTER = 5  # seconds, sent with 503s when the parser is saturated
+SHEET_CACHE_MAX_BYTES = int(os.environ.get('SHEET_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+SNAPSHOT_MODE = 0o644  # schedule snapshots are readable like the workbooks they mirror
+WATCH_FILES = os.environ.get('WATCH_FILES', 'true') == 'true'
+WATCH_DIRECTORIES = ('uploads', 'certe_fresh')
+WATCH_SUFFIXES = ('.xlsx', '.xlsb')
+WATCH_POLL_INTERVAL = 2  # seconds, when inotify is unavailable
+WATCH_DEBOUNCE = 0.5  # seconds of quiet before a burst of writes is reloaded
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', 1024))  # smaller bodies go out as-is
+COMPRESS_MIMETYPES = {'application/json', 'text/html'}
+ENCODED_BODY_CACHE_SIZE = 64  # cacheable JSON bodies kept already encoded
+ENCODED_BODY_MAX_AGE = 15  # seconds an encoded body is reused for the same ETag
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # fingerprinted static URLs never change content
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'certe_request_duration_seconds', 'Request latency by route.', ['route', 'method'])
+REQUESTS = REGISTRY.counter(
+    'certe_requests_total', 'Requests by route, method and status.', ['route', 'method', 'status'])
+RESPONSE_BYTES = REGISTRY.counter(
+    'certe_response_bytes_total', 'Response body bytes by route (streams excluded).', ['route'])
+EXCEL_PHASE_SECONDS = REGISTRY.histogram(
+    'certe_excel_phase_seconds',
+    'Workbook read time by phase: index (sheet list), load (open+parse), format (cell dicts), '
+    'serialize (JSON), compress (gzip/br).',
+    ['phase'])
+SHEET_CACHE_LOOKUPS = REGISTRY.counter(
+    'certe_sheet_cache_lookups_total',
+    'Sheet cache lookups by result (hit/miss, or stale while a newer version loads).', ['result'])
+SHEET_CACHE_BYTES = REGISTRY.gauge('certe_sheet_cache_bytes', 'Estimated bytes held by the sheet cache.')
+PARSE_REJECTIONS = REGISTRY.counter(
+    'certe_parse_rejections_total', 'Upload parses refused with a 503, by reason.', ['reason'])
+
+@app.before_request
+def _start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    REQUEST_SECONDS.observe(time.perf_counter() - g.request_start,
+                            route=route, method=request.method)
+    REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    if not response.is_streamed and response.content_length:
+        RESPONSE_BYTES.inc(response.content_length, route=route)
+    return response
+
+# Registered after the metrics hook so it runs first and RESPONSE_BYTES counts
+# what actually goes over the wire
+@app.after_request
+def _compress_response(response):
+    """Compress JSON/HTML bodies of at least COMPRESS_MIN_BYTES for clients that accept it."""
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None or response.content_length < COMPRESS_MIN_BYTES:
+        return response
+    with EXCEL_PHASE_SECONDS.time(phase='compress'):
+        response.set_data(compress(response.get_data(), encoding))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak)
+    return response
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
-def parse_cell_reference(cell_ref):
-    column = ""
-    row = ""
-    for char in cell_ref:
-        if char.isalpha():
-            column += char
-        else:
-            row += char
-    
-    col_num = 0
-    for i, char in enumerate(reversed(column.upper())):
-        col_num += (ord(char) - ord('A') + 1) * (26 ** i)
-    return int(row) - 1, col_num - 1
+class SheetCache:
+    """Byte-bounded LRU cache of decoded worksheets.
 
-def read_excel_data(filepath, start_cell, end_cell):
-    start_row, start_col = parse_cell_reference(start_cell)
-    end_row, end_col = parse_cell_reference(end_cell)
-    
+    Entries are keyed by the file's absolute path, sheet name, mtime and size, so
+    replacing a workbook on disk invalidates its cached grids on the next read.
+    While one thread decodes the new version, other readers of that sheet get
+    the previous grid instead of waiting or decoding it again.
+
+    Like ScheduleStore.watched, once a FileWatcher owns a directory (listed in
+    ``watched_directories``) reads of its cached workbooks skip the stat and
+    serve the newest grid as-is; the watcher loads a new version with
+    ``refresh=True`` once its writes have settled, so requests never decode a
+    half-written file.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.watched_directories = frozenset()
+        self._entries = OrderedDict()
+        self._latest = {}  # (path, sheet) -> key of its newest grid
+        self._size = 0
+        self._loading = set()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, filepath, loader, sheet=None, refresh=False):
+        path = os.path.abspath(filepath)
+        if not refresh and os.path.dirname(path) in self.watched_directories:
+            with self._lock:
+                key = self._latest.get((path, sheet))
+                if key is not None:
+                    self._entries.move_to_end(key)
+                    SHEET_CACHE_LOOKUPS.inc(result='hit')
+                    return self._entries[key][0]
+        stat = os.stat(filepath)
+        key = (path, sheet, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                SHEET_CACHE_LOOKUPS.inc(result='hit')
+                return entry[0]
+            if (path, sheet) in self._loading:
+                stale = [v for k, v in self._entries.items() if k[:2] == (path, sheet)]
+                if stale:
+                    SHEET_CACHE_LOOKUPS.inc(result='stale')
+                    return stale[-1][0]
+            self._loading.add((path, sheet))
+
+        SHEET_CACHE_LOOKUPS.inc(result='miss')
+        try:
+            with EXCEL_PHASE_SECONDS.time(phase='load'):
+                grid = loader(filepath, sheet)
+        finally:
+            with self._lock:
+                self._loading.discard((path, sheet))
+        nbytes = _estimate_grid_bytes(grid)
+        with self._lock:
+            # Drop any grid decoded from an older version of the same file
+            for stale in [k for k in self._entries if k[0] == path and k[2:] != key[2:]]:
+                self._pop(stale)
+            if key not in self._entries:
+                self._entries[key] = (grid, nbytes)
+                self._latest[key[:2]] = key
+                self._size += nbytes
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                self._pop(next(iter(self._entries)))
+            SHEET_CACHE_BYTES.set(self._size)
+        logging.debug(f"Cached {path} ({nbytes} bytes, {self._size} total)")
+        return grid
+
+    def _pop(self, key):
+        self._size -= self._entries.pop(key)[1]
+        if self._latest.get(key[:2]) == key:
+            del self._latest[key[:2]]
+
+    def cached_sheets(self, filepath):
+        """Names of the sheets of ``filepath`` that currently have a cached grid."""
+        path = os.path.abspath(filepath)
+        with self._lock:
+            return {key[1] for key in self._entries if key[0] == path}
+
+    def cached_paths(self):
+        with self._lock:
+            return {key[0] for key in self._entries}
+
+    def discard(self, filepath):
+        """Drop every cached grid of ``filepath``, e.g. once the file is deleted."""
+        path = os.path.abspath(filepath)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._pop(key)
+            SHEET_CACHE_BYTES.set(self._size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self._size = 0
+
+class WorkbookIndex:
+    """Sheet names and declared dimensions of each workbook, read once per file version.
+
+    Skips the stat for workbooks in ``watched_directories``, as SheetCache does.
+    """
+
+    def __init__(self):
+        self.watched_directories = frozenset()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def sheets(self, filepath, refresh=False):
+        path = os.path.abspath(filepath)
+        if not refresh and os.path.dirname(path) in self.watched_directories:
+            with self._lock:
+                entry = self._entries.get(path)
+            if entry is not None:
+                return entry[1]
+        stat = os.stat(filepath)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        with EXCEL_PHASE_SECONDS.time(phase='index'):
+            sheets = describe_workbook(filepath)
+        with self._lock:
+            self._entries[path] = (version, sheets)
+        return sheets
+
+    def discard(self, filepath):
+        with self._lock:
+            self._entries.pop(os.path.abspath(filepath), None)
+
+    def resolve(self, filepath, sheet, refresh=False):
+        """Return the index entry for ``sheet`` (a name or 1-based index string)."""
+        sheets = self.sheets(filepath, refresh)
+        return sheets[find_sheet([entry['name'] for entry in sheets], sheet) - 1]
+
+class EncodedBodyCache:
+    """LRU of serialized response bodies keyed by representation ETag.
+
+    Each entry holds the body as sent, already compressed when the ETag names a
+    content coding, so repeat 200s for the same ETag skip both JSON encoding and
+    compression. Entries older than ``max_age`` seconds are rebuilt.
+    """
+
+    def __init__(self, max_entries, max_age):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.max_age:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = build()
+        with self._lock:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+sheet_cache = SheetCache(SHEET_CACHE_MAX_BYTES)
+workbook_index = WorkbookIndex()
+encoded_bodies = EncodedBodyCache(ENCODED_BODY_CACHE_SIZE, ENCODED_BODY_MAX_AGE)
+_parse_executor = None
+_parse_executor_lock = threading.Lock()
+_parse_slots = threading.BoundedSemaphore(PARSE_QUEUE_LIMIT)
+
+def _estimate_grid_bytes(grid):
+    total = sys.getsizeof(grid)
+    for row in grid:
+        total += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return total
+
+def _default_style():
+    return {
+        'bold': False,
+        'italic': False,
+        'align': 'right',
+        'format': 'general'
+    }
+
+def _xlsb_cell_info(value):
+    cell_info = {
+        'value': '' if value is None else str(value),
+        'type': '',
+        'style': _default_style()
+    }
+    if isinstance(value, float):
+        cell_info['value'] = f"{value:.2f}"
+    return cell_info
+
+def _xlsx_cell_info(value):
+    return {
+        'value': str(value) if pd.notna(value) else '',
+        'type': 'n' if isinstance(value, (int, float)) else 's',
+        'style': _default_style()
+    }
+
+def _format_window(window, is_xlsb, height, width):
     data = []
-    if filepath.endswith('.xlsb'):
-        with open_workbook(filepath) as wb:
-            sheet = wb.get_sheet(1)
-            rows = sheet.rows()
-            for _ in range(start_row):
-                next(rows, None)
-            for row_idx in range(start_row, end_row + 1):
-                try:
-                    row = next(rows)
-                    row_data = []
-                    for col_idx in range(start_col, end_col + 1):
-                        cell = row[col_idx] if col_idx < len(row) else None
-                        cell_info = {
-                            'value': str(cell.v) if cell and cell.v is not None else '',
-                            'type': getattr(cell, 't', ''),
-                            'style': {
-                                'bold': bool(getattr(cell, 'bold', False)),
-                                'italic': bool(getattr(cell, 'italic', False)),
-                                'align': getattr(cell, 'alignment', 'right'),
-                                'format': getattr(cell, 'number_format', 'general')
-                            }
-                        }
-                        if cell and cell.v is not None:
-                            if isinstance(cell.v, float):
-                                if cell_info['style']['format'] == 'general':
-                                    cell_info['value'] = f"{cell.v:.2f}"
-                                elif '%' in str(cell_info['style']['format']):
-                                    cell_info['value'] = f"{cell.v:.1%}"
-                                    cell_info['style']['format'] = 'percentage'
-                            elif isinstance(cell.v, int):
-                                cell_info['value'] = str(cell.v)
-                        row_data.append(cell_info)
-                    data.append(row_data)
-                except StopIteration:
-                    break
+    if is_xlsb:
+        # Rows past the end of the sheet are dropped, missing columns are blank
+        for row in window[:height]:
+            data.append([
+                _xlsb_cell_info(row[col_idx] if col_idx < len(row) else None)
+                for col_idx in range(width)
+            ])
     else:
-        df = pd.read_excel(filepath)
-        for row in range(start_row, end_row + 1):
+        for row_idx in range(height):
+            row = window[row_idx] if row_idx < len(window) else []
             row_data = []
-            for col in range(start_col, end_col + 1):
-                try:
-                    value = df.iloc[row, col]
-                    cell_info = {
-                        'value': str(value) if pd.notna(value) else '',
-                        'type': 'n' if isinstance(value, (int, float)) else 's',
-                        'style': {
-                            'bold': False,
-                            'italic': False,
-                            'align': 'right',
-                            'format': 'general'
-                        }
-                    }
-                    row_data.append(cell_info)
-                except:
-                    row_data.append({
-                        'value': '',
-                        'type': 's',
-                        'style': {
-                            'bold': False,
-                            'italic': False,
-                            'align': 'right',
-                            'format': 'general'
-                        }
-                    })
+            for col_idx in range(width):
+                if col_idx < len(row):
+                    row_data.append(_xlsx_cell_info(row[col_idx]))
+                else:
+                    row_data.append({'value': '', 'type': 's', 'style': _default_style()})
             data.append(row_data)
     return data
 
+def make_range(start_cell, end_cell, sheet=None):
+    """Build a CellRange from a pair of ``A1`` corner references."""
+    start_row, start_col = parse_cell_reference(start_cell)
+    end_row, end_col = parse_cell_reference(end_cell)
+    return CellRange(sheet or None, min(start_row, end_row), min(start_col, end_col),
+                     max(start_row, end_row), max(start_col, end_col))
+
+def _request_range(fields):
+    """Read a range from request fields: ``range`` ("G1:K5", "G:K", "Sheet2!A1:B2")
+    or ``start_cell``/``end_cell``, with an optional ``sheet`` override."""
+    if fields.get('range'):
+        cell_range = parse_range(fields['range'])
+    else:
+        cell_range = make_range(fields.get('start_cell', 'A1'), fields.get('end_cell', 'A1'))
+    if fields.get('sheet'):
+        cell_range = cell_range._replace(sheet=fields['sheet'])
+    return cell_range
+
+def _request_ranges(items):
+    """``_request_range`` for a list of request items, as in /get_data/batch.
+
+    The corners of every start_cell/end_cell item are parsed in one
+    ``parse_cell_references`` call and ordered with array min/max.
+    """
+    corner_items = [i for i, fields in enumerate(items) if not fields.get('range')]
+    rows, cols = parse_cell_references(
+        [items[i].get(key, 'A1') for i in corner_items for key in ('start_cell', 'end_cell')])
+    rows, cols = rows.reshape(-1, 2), cols.reshape(-1, 2)
+    corners = zip(rows.min(axis=1).tolist(), cols.min(axis=1).tolist(),
+                  rows.max(axis=1).tolist(), cols.max(axis=1).tolist())
+    cell_ranges = [parse_range(fields['range']) if fields.get('range') else None for fields in items]
+    for i, corner in zip(corner_items, corners):
+        cell_ranges[i] = CellRange(None, *corner)
+    return [
+        cell_range._replace(sheet=fields['sheet']) if fields.get('sheet') else cell_range
+        for cell_range, fields in zip(cell_ranges, items)
+    ]
+
+def cached_sheet_grid(filepath, sheet=None, refresh=False):
+    """Decoded grid of one sheet, cached under its canonical name so ``"2"``,
+    ``"schedule"`` and ``"Schedule"`` share a single entry. ``refresh`` checks
+    the file even where the watcher normally owns reloads."""
+    name = workbook_index.resolve(filepath, sheet, refresh)['name']
+    return sheet_cache.get_or_load(filepath, load_sheet_grid, name, refresh)
+
+def read_excel_ranges(source, cell_ranges, use_cache=True, is_xlsb=None,
+                      window_reader=read_excel_range):
+    """Read several ranges from one workbook.
+
+    ``cell_ranges`` holds CellRange values or (start_cell, end_cell) pairs; a
+    range without a sheet reads the first sheet. Each sheet is decoded once:
+    cached reads slice the decoded sheet, uncached reads parse the bounding box
+    of that sheet's ranges in a single pass with ``window_reader``. Whole-column
+    ranges stop at the last row of the sheet. Only paths can be cached; file
+    objects are read with ``use_cache=False``. Results are in request order.
+    """
+    if is_xlsb is None:
+        is_xlsb = source.endswith('.xlsb')
+    ranges = [
+        item if isinstance(item, CellRange) else make_range(*item)
+        for item in cell_ranges
+    ]
+    by_sheet = OrderedDict()
+    for position, cell_range in enumerate(ranges):
+        by_sheet.setdefault(cell_range.sheet, []).append(position)
+
+    results = [None] * len(ranges)
+    for sheet, positions in by_sheet.items():
+        sheet_ranges = [ranges[position] for position in positions]
+        if use_cache:
+            grid = cached_sheet_grid(source, sheet)
+            top, left = 0, 0
+        else:
+            top = min(r.start_row for r in sheet_ranges)
+            left = min(r.start_col for r in sheet_ranges)
+            bottom = max(MAX_ROWS - 1 if r.end_row is None else r.end_row for r in sheet_ranges)
+            right = max(r.end_col for r in sheet_ranges)
+            with EXCEL_PHASE_SECONDS.time(phase='load'):
+                grid = window_reader(source, top, left, bottom, right, is_xlsb, sheet)
+        last_row = top + len(grid) - 1
+
+        with EXCEL_PHASE_SECONDS.time(phase='format'):
+            for position, (_, start_row, start_col, end_row, end_col) in zip(positions, sheet_ranges):
+                if end_row is None:
+                    end_row = max(last_row, start_row - 1)
+                window = [
+                    row[start_col - left:end_col - left + 1]
+                    for row in grid[start_row - top:end_row - top + 1]
+                ]
+                results[position] = _format_window(window, is_xlsb, end_row - start_row + 1,
+                                                   end_col - start_col + 1)
+    return results
+
+def read_excel_data(filepath, start_cell, end_cell, use_cache=True, sheet=None):
+    return read_excel_ranges(filepath, [make_range(start_cell, end_cell, sheet)], use_cache)[0]
+
+def to_columnar(data):
+    """Convert a grid of cell dicts into the compact columnar payload.
+
+    Values and types become flat row-major arrays, and each distinct style is
+    stored once in ``styles`` and referenced from ``style_ids`` by index.
+    """
+    values, types, style_ids = [], [], []
+    styles, style_index = [], {}
+    for row in data:
+        for cell in row:
+            values.append(cell['value'])
+            types.append(cell['type'])
+            style = cell['style']
+            key = (style['bold'], style['italic'], style['align'], style['format'])
+            if key not in style_index:
+                style_index[key] = len(styles)
+                styles.append(style)
+            style_ids.append(style_index[key])
+    return {
+        'shape': [len(data), len(data[0]) if data else 0],
+        'values': values,
+        'types': types,
+        'styles': styles,
+        'style_ids': style_ids
+    }
+
+Game = namedtuple('Game', ['start', 'away_team', 'home_team', 'arena', 'start_label'])
+ScheduleDay = namedtuple('ScheduleDay', ['games', 'starts'])
+EMPTY_DAY = ScheduleDay((), np.empty(0, dtype=np.int64))
+
+class ScheduleStore:
+    """Date-indexed view of a schedule workbook.
+
+    The workbook is parsed once into a dict of date -> ScheduleDay, holding the
+    games sorted by start time and their start times as an int64 array of epoch
+    seconds, and only re-parsed when the file's mtime or size changes. Naive
+    start times are read as wall-clock time in ``tz`` (server local time if None).
+
+    Once a FileWatcher owns reloads (``watched``), reads stop checking the file
+    and serve the loaded index as-is; ``reload`` builds a new one off the request
+    path and swaps it in with a single assignment.
+    """
+
+    def __init__(self, path, loader, tz=None):
+        self.path = path
+        self.tz = tz
+        self.watched = False
+        self._loader = loader
+        self._state = (None, {})  # (fingerprint, date -> ScheduleDay), replaced as a whole
+        self._lock = threading.Lock()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def day(self, day):
+        return self._current()[1].get(day, EMPTY_DAY)
+
+    def games_on(self, day):
+        return self.day(day).games
+
+    def fingerprint(self):
+        """Return the (mtime_ns, size) of the currently loaded schedule."""
+        return self._current()[0]
+
+    def reload(self):
+        """Re-read the workbook if it changed; readers keep the old index until done."""
+        if not self.exists():
+            return
+        try:
+            self._refresh()
+        except Exception as e:
+            logging.error(f"Error reloading schedule {self.path}: {str(e)}")
+
+    def _current(self):
+        state = self._state
+        if not self.watched or state[0] is None:
+            self._refresh()
+            state = self._state
+        return state
+
+    def preload(self):
+        if not self.exists():
+            return
+        try:
+            self._refresh()
+        except Exception as e:
+            logging.error(f"Error preloading schedule {self.path}: {str(e)}")
+
+    def _refresh(self):
+        stat = os.stat(self.path)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        if fingerprint == self._state[0]:
+            return
+        with self._lock:
+            if fingerprint == self._state[0]:
+                return
+            games = sorted(self._load_games(fingerprint), key=lambda game: game.start)
+            starts = self._epoch_seconds(games)
+            by_date = {}
+            for index, game in enumerate(games):
+                by_date.setdefault(game.start.date(), []).append(index)
+            by_date = {
+                day: ScheduleDay(tuple(games[i] for i in indexes), starts[indexes])
+                for day, indexes in by_date.items()
+            }
+            self._state = (fingerprint, by_date)
+            logging.info(f"Loaded schedule {self.path} ({len(by_date)} game days)")
+
+    @property
+    def snapshot_path(self):
+        return self.path + '.npz'
+
+    def _load_games(self, fingerprint):
+        """Load games from the binary snapshot, rebuilding it if it is stale.
+
+        The rebuild runs under a file lock, so when the workbook changes only one
+        gunicorn worker parses it and the others read the snapshot it wrote.
+        """
+        games = read_schedule_snapshot(self.snapshot_path, fingerprint)
+        if games is not None:
+            return games
+        with _file_lock(self.snapshot_path + '.lock'):
+            games = read_schedule_snapshot(self.snapshot_path, fingerprint)
+            if games is not None:
+                return games
+            games = self._loader(self.path)
+            try:
+                write_schedule_snapshot(self.snapshot_path, games, fingerprint)
+            except OSError as e:
+                logging.error(f"Could not write schedule snapshot {self.snapshot_path}: {str(e)}")
+        return games
+
+    def _epoch_seconds(self, games):
+        if self.tz is None:
+            return np.array([game.start.timestamp() for game in games], dtype=np.int64)
+        # Localize the whole season at once; DST-ambiguous times resolve to DST
+        starts = pd.DatetimeIndex([game.start for game in games]).tz_localize(
+            self.tz, ambiguous=np.ones(len(games), dtype=bool), nonexistent='shift_forward')
+        return starts.as_unit('s').asi8
+
+@contextmanager
+def _file_lock(lock_path):
+    """Hold an exclusive flock on ``lock_path``; a no-op where fcntl is missing."""
+    if fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(lock_path, 'a')
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def write_schedule_snapshot(snapshot_path, games, fingerprint):
+    """Write games as an uncompressed .npz of fixed-width columns.
+
+    The source workbook's (mtime_ns, size) is stored with the columns so a
+    snapshot is only trusted while it matches the workbook next to it. The file
+    is written under a temporary name and renamed into place, so workers booting
+    together never read a partial snapshot; the temporary file is removed if
+    either step fails. Snapshots are created with SNAPSHOT_MODE permissions.
+    """
+    columns = {
+        'source': np.array(fingerprint, dtype=np.int64),
+        'start': np.array([game.start for game in games], dtype='datetime64[s]'),
+        'away_team': np.array([str(game.away_team) for game in games], dtype=str),
+        'home_team': np.array([str(game.home_team) for game in games], dtype=str),
+        'arena': np.array([str(game.arena) for game in games], dtype=str),
+        'start_label': np.array([str(game.start_label) for game in games], dtype=str)
+    }
+    directory = os.path.dirname(snapshot_path) or '.'
+    with tempfile.NamedTemporaryFile(dir=directory, suffix='.tmp', delete=False) as tmp:
+        try:
+            np.savez(tmp, **columns)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    try:
+        # NamedTemporaryFile creates the file 0600 and os.replace keeps that mode
+        os.chmod(tmp.name, SNAPSHOT_MODE)
+        os.replace(tmp.name, snapshot_path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+def read_schedule_snapshot(snapshot_path, fingerprint):
+    """Return the games in a snapshot, or None if it is missing or stale."""
+    try:
+        with np.load(snapshot_path, allow_pickle=False) as columns:
+            if tuple(columns['source'].tolist()) != tuple(fingerprint):
+                return None
+            return [
+                Game(*row) for row in zip(
+                    columns['start'].tolist(), columns['away_team'].tolist(),
+                    columns['home_team'].tolist(), columns['arena'].tolist(),
+                    columns['start_label'].tolist())
+            ]
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+def _load_season_schedule(path):
+    df = pd.read_excel(path, engine='openpyxl')
+    # Accept both our column names and the basketball-reference export headers
+    df = df.rename(columns={
+        'Date': 'date',
+        'Game Date': 'date',
+        'Start Time (ET)': 'time',
+        'Start (ET)': 'time',
+        'Away Team': 'away_team',
+        'Visitor/Neutral': 'away_team',
+        'Home Team': 'home_team',
+        'Home/Neutral': 'home_team',
+        'Arena': 'arena'
+    })
+    df = df.dropna(subset=['date', 'time'])
+    df['time'] = df['time'].astype(str)
+    # "7:30p" -> "7:30pm" so the times parse as 12-hour clock values
+    times = df['time'].str.replace(r'([ap])$', r'\1m', regex=True)
+    starts = pd.to_datetime(df['date'].astype(str) + ' ' + times, format='mixed')
+    arenas = df['arena'].fillna('') if 'arena' in df else [''] * len(df)
+    return [
+        Game(start.to_pydatetime(), away, home, arena, label)
+        for start, away, home, arena, label in zip(
+            starts, df['away_team'], df['home_team'], arenas, df['time'])
+    ]
+
+def _load_xlsb_schedule(path):
+    df = pd.read_excel(path, engine='pyxlsb')
+    dates = pd.to_datetime(df['GameDate']).dt.date
+    times = pd.to_datetime(df['GameTime']).dt.time
+    return [
+        Game(datetime.combine(day, time), away, home, '', time.strftime('%H:%M'))
+        for day, time, away, home in zip(dates, times, df['AwayTeam'], df['HomeTeam'])
+    ]
+
+season_schedule = ScheduleStore(
+    os.path.join(app.config['UPLOAD_FOLDER'], 'NBA_Schedule_2024-25.xlsx'), _load_season_schedule, ET)
+nba_schedule = ScheduleStore(
+    os.path.join(app.config['UPLOAD_FOLDER'], 'NBA_Schedule.xlsb'), _load_xlsb_schedule)
+def preload_default_workbook():
+    if not os.path.exists(DEFAULT_FILE):
+        return
+    try:
+        cached_sheet_grid(DEFAULT_FILE)
+    except Exception as e:
+        logging.error(f"Error preloading {DEFAULT_FILE}: {str(e)}")
+
+# Load everything at import. With gunicorn's preload_app (see gunicorn.conf.py)
+# this runs once in the master and workers share the pages copy-on-write.
+season_schedule.preload()
+nba_schedule.preload()
+preload_default_workbook()
+
+class GameFeed:
+    """Shared watcher that turns today's games into Server-Sent Events.
+
+    A single daemon thread per worker, started on the first subscriber, polls the
+    schedule store every ``interval`` seconds. A new event is published only when
+    the ET day's games change or a game starts, and every open stream is woken
+    from the same computed state.
+    """
+
+    def __init__(self, store, tz, interval):
+        self.store = store
+        self.tz = tz
+        self.interval = interval
+        self._cond = threading.Condition()
+        self._version = 0
+        self._snapshot = None
+        self._event = None
+        self._thread = None
+
+    def subscribe(self, max_seconds, heartbeat=15):
+        """Yield SSE messages: a snapshot first, then one event per change.
+
+        Streams close after ``max_seconds`` so a gthread worker thread is not held
+        forever; EventSource reconnects on its own and gets a fresh snapshot.
+        """
+        version, message = self._open()
+        yield message
+
+        deadline = time.monotonic() + max_seconds
+        while time.monotonic() < deadline:
+            with self._cond:
+                self._cond.wait_for(lambda: self._version != version, timeout=heartbeat)
+                version, message = self._message_since(version)
+            yield message
+
+    async def subscribe_async(self, max_seconds, heartbeat=15, tick=1):
+        """Async counterpart of ``subscribe`` for asgi.py.
+
+        Waits on the event loop, checking for a new version every ``tick``
+        seconds, so an open stream holds no thread at all.
+        """
+        version, message = await asyncio.to_thread(self._open)
+        yield message
+
+        deadline = time.monotonic() + max_seconds
+        while time.monotonic() < deadline:
+            waited = 0
+            while self._version == version and waited < heartbeat:
+                await asyncio.sleep(tick)
+                waited += tick
+            with self._cond:
+                version, message = self._message_since(version)
+            yield message
+
+    def _open(self):
+        self._start()
+        with self._cond:
+            return self._version, 'retry: 3000\n' + _sse_message('snapshot', self._snapshot)
+
+    def _message_since(self, version):
+        """Return (current version, message bringing a ``version`` client up to date); call with _cond held."""
+        if self._version == version:
+            message = ': keep-alive\n\n'
+        elif self._version == version + 1:
+            message = _sse_message(*self._event)
+        else:
+            # Missed more than one change; resend the full state
+            message = _sse_message('snapshot', self._snapshot)
+        return self._version, message
+
+    def _start(self):
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._poll()
+            self._thread = threading.Thread(target=self._run, name='game-feed', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self._poll()
+            except Exception as e:
+                logging.error(f"Error polling game feed: {str(e)}")
+
+    def _poll(self):
+        snapshot = self._build_snapshot()
+        with self._cond:
+            previous = self._snapshot
+            if snapshot == previous:
+                return
+            if previous is None or previous['date'] != snapshot['date']:
+                self._event = ('snapshot', snapshot)
+            else:
+                self._event = ('update', _diff_games(previous, snapshot))
+            self._snapshot = snapshot
+            self._version += 1
+            self._cond.notify_all()
+
+    def _build_snapshot(self):
+        today = datetime.now(self.tz).date()
+        schedule_day = self.store.day(today) if self.store.exists() else EMPTY_DAY
+        now = time.time()
+        games = []
+        for game, start in zip(schedule_day.games, schedule_day.starts.tolist()):
+            games.append({
+                'id': _game_id(game, start),
+                'teams': f"{game.away_team} @ {game.home_team}",
+                'away_team': game.away_team,
+                'home_team': game.home_team,
+                'arena': game.arena,
+                'start_time': game.start_label,
+                'start': start,
+                'datetime': datetime.fromtimestamp(start, self.tz).isoformat(),
+                'tooltip': f"Game starts at {game.start_label} ET",
+                'started': start <= now
+            })
+        return {'date': today.isoformat(), 'games': games}
+
+def _game_id(game, start):
+    # A fingerprint of the whole row, so an edit to any field of a game shows
+    # up in the diff as the old id removed and the new one added
+    row = (start, game.away_team, game.home_team, game.arena, game.start_label)
+    return hashlib.sha1(repr(row).encode()).hexdigest()[:12]
+
+def _diff_games(previous, current):
+    before = {game['id']: game for game in previous['games']}
+    after = {game['id']: game for game in current['games']}
+    return {
+        'date': current['date'],
+        'added': [game for game_id, game in after.items() if game_id not in before],
+        'removed': [game_id for game_id in before if game_id not in after],
+        'started': [
+            game_id for game_id, game in after.items()
+            if game['started'] and game_id in before and not before[game_id]['started']
+        ]
+    }
+
+def _sse_message(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+game_feed = GameFeed(season_schedule, ET, GAME_FEED_INTERVAL)
+
+def reload_changed_files(paths):
+    """Rebuild whatever was derived from the changed workbooks at ``paths``.
+
+    Runs on the watcher thread: schedule stores swap in their new index when it
+    is complete, and cached sheets are decoded again while readers keep getting
+    the previous grid.
+    """
+    changed = {os.path.abspath(path) for path in paths}
+    logging.info(f"Reloading changed files: {sorted(changed)}")
+    for store in (season_schedule, nba_schedule):
+        if os.path.abspath(store.path) in changed:
+            store.reload()
+    _refresh_cached_sheets(changed)
+
+def _refresh_cached_sheets(paths):
+    for path in paths:
+        if not os.path.exists(path):
+            sheet_cache.discard(path)
+            workbook_index.discard(path)
+            continue
+        sheets = sheet_cache.cached_sheets(path)
+        if path == os.path.abspath(DEFAULT_FILE):
+            sheets.add(None)
+        for sheet in sheets:
+            try:
+                cached_sheet_grid(path, sheet, refresh=True)
+            except Exception as e:
+                logging.error(f"Error reloading sheet {sheet} of {path}: {str(e)}")
+
+file_watcher = FileWatcher(WATCH_DIRECTORIES, WATCH_SUFFIXES, reload_changed_files,
+                           WATCH_POLL_INTERVAL, WATCH_DEBOUNCE)
+
+def start_file_watcher():
+    """Start this process's watcher and hand schedule and sheet reloads over to it."""
+    if file_watcher.start():
+        # Catch anything that changed between the preload and the watch
+        for store in (season_schedule, nba_schedule):
+            store.reload()
+            store.watched = True
+        _refresh_cached_sheets(sheet_cache.cached_paths())
+        watched = frozenset(os.path.abspath(directory) for directory in WATCH_DIRECTORIES)
+        sheet_cache.watched_directories = workbook_index.watched_directories = watched
+
+@app.before_request
+def _ensure_file_watcher():
+    # Started lazily so that each gunicorn worker, not the preloading master,
+    # owns the thread
+    if WATCH_FILES:
+        start_file_watcher()
+
+@app.cli.command('snapshot-schedules')
+def snapshot_schedules_command():
+    """Convert the schedule workbooks in uploads/ to .npz snapshots."""
+    for store in (season_schedule, nba_schedule):
+        if store.exists():
+            stat = os.stat(store.path)
+            write_schedule_snapshot(store.snapshot_path, store._loader(store.path),
+                                    (stat.st_mtime_ns, stat.st_size))
+            print(f"Wrote {store.snapshot_path}")
+
+def conditional_json(etag_parts, last_modified, build_payload):
+    """jsonify ``build_payload()`` unless the client's cached copy is still current.
+
+    The strong ETag is a hash of ``etag_parts``, suffixed with the negotiated
+    content coding; a matching ``If-None-Match`` (or an ``If-Modified-Since`` at
+    or after ``last_modified``) gets a bodyless 304 without calling
+    ``build_payload``. Bodies are built and compressed once per ETag and then
+    served from ``encoded_bodies``.
+    """
+    encoding = choose_encoding(request.accept_encodings)
+    etag = hashlib.sha1(repr(etag_parts).encode()).hexdigest()
+    if encoding:
+        etag = f'{etag}-{encoding}'
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        def build_body():
+            body = jsonify(build_payload()).get_data()
+            if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+                return body, None
+            return compress(body, encoding, best=True), encoding
+
+        body, content_encoding = encoded_bodies.get_or_build(etag, build_body)
+        response = app.response_class(body, mimetype='application/json')
+        if content_encoding:
+            response.headers['Content-Encoding'] = content_encoding
+    else:
+        response = app.response_class(status=304)
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+def _schedule_last_modified(store, today):
+    """The later of the schedule file's mtime and the start of ``today``.
+
+    Bodies change when the day rolls over as well as when the file does, so
+    If-Modified-Since alone must not confirm yesterday's list.
+    """
+    midnight = datetime.combine(today, datetime.min.time())
+    midnight = store.tz.localize(midnight) if store.tz else midnight.astimezone()
+    modified = max(store.fingerprint()[0] // 10**9, int(midnight.timestamp()))
+    return datetime.fromtimestamp(min(modified, int(time.time())), pytz.utc)
+
+asset_manifest = AssetManifest(app.static_folder)
+
+@app.url_defaults
+def _fingerprint_static_urls(endpoint, values):
+    # url_for('static', filename='css/style.css') -> /static/css/style.<hash>.css
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = asset_manifest.hashed(values['filename'])
+
+def serve_static(filename):
+    """Serve static files, caching fingerprinted URLs for a year.
+
+    Unhashed paths still work but are revalidated on every use. Hashed text
+    assets are sent precompressed when the client accepts it.
+    """
+    asset = asset_manifest.lookup(filename)
+    if asset is None:
+        return send_from_directory(app.static_folder, filename, max_age=0)
+
+    encoding = choose_encoding(request.accept_encodings) if asset.variants else None
+    if encoding in asset.variants:
+        etag = f'{asset.digest}-{encoding}'
+        if is_resource_modified(request.environ, etag=etag):
+            response = app.response_class(asset.variants[encoding],
+                                          mimetype=mimetypes.guess_type(asset.filename)[0])
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = app.response_class(status=304)
+        response.set_etag(etag)
+    else:
+        response = send_from_directory(app.static_folder, asset.filename,
+                                       max_age=IMMUTABLE_MAX_AGE)
+    if asset.variants:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = IMMUTABLE_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+app.view_functions['static'] = serve_static
+
 @app.route('/')
 def index():
     return render_template('index.html', 
                          default_file=os.path.basename(DEFAULT_FILE),
                          default_start_cell=DEFAULT_START_CELL,
-                         default_end_cell=DEFAULT_END_CELL)
+                         default_end_cell=DEFAULT_END_CELL,
+                         game_stream=GAME_STREAM)
+
+def _uploaded_workbook():
+    """Validate the uploaded workbook, returning (file, error message)."""
+    if 'file' not in request.files:
+        return None, 'No file uploaded'
+    
+    file = request.files['file']
+    if file.filename == '':
+        return None, 'No file selected'
+    
+    if not (file.filename.endswith('.xlsb') or file.filename.endswith('.xlsx')):
+        return None, 'Please upload an XLSB or XLSX file'
+    return file, None
+
+def get_parse_executor():
+    """Return this worker's process pool for parsing uploaded workbooks.
+
+    The pool is created on first use, after gunicorn has forked, and its
+    processes come from a forkserver that only imports excel_reader, so they
+    never carry copies of the Flask app or its preloaded data.
+    """
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload(['excel_reader'])
+            else:
+                context = multiprocessing.get_context('spawn')
+            _parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=context)
+        return _parse_executor
+
+class ParserBusy(Exception):
+    """Raised when a workbook parse is refused or abandoned because the pool is saturated."""
+
+def _recycle_parse_executor(executor):
+    """Retire ``executor``: later parses get a fresh pool and its processes are killed.
+
+    Cancelling a future does not stop a parse that is already running, so this
+    is the only way to take a runaway parse's CPU back. Queued parses are
+    cancelled and running ones fail with BrokenProcessPool, which releases
+    their slots through the usual done callbacks.
+    """
+    global _parse_executor
+    with _parse_executor_lock:
+        if _parse_executor is executor:
+            _parse_executor = None
+    # ProcessPoolExecutor has no public way to stop running work before 3.14;
+    # shutdown() drops its process table, so take it first
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+def _admit_parse(fn, args):
+    """Take a parse slot and submit ``fn(*args)``; return (executor, future)."""
+    if not _parse_slots.acquire(blocking=False):
+        PARSE_REJECTIONS.inc(reason='saturated')
+        raise ParserBusy('Workbook parser is busy, please retry shortly')
+    try:
+        executor = get_parse_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            # A parse process died (e.g. killed for memory); start a fresh pool
+            _recycle_parse_executor(executor)
+            executor = get_parse_executor()
+            future = executor.submit(fn, *args)
+    except Exception:
+        _parse_slots.release()
+        raise
+    future.add_done_callback(lambda _: _parse_slots.release())
+    return executor, future
+
+def submit_parse(fn, *args):
+    """Run ``fn(*args)`` in the parse pool with admission control.
+
+    At most PARSE_QUEUE_LIMIT parses may be running or queued per worker; beyond
+    that the request is refused immediately rather than queued. A caller waits
+    at most PARSE_TIMEOUT seconds. Both cases raise ParserBusy. On timeout the
+    whole pool is recycled, killing the runaway parse, and any other parse that
+    was running in it is retried once on the new pool within its own deadline.
+    """
+    deadline = time.monotonic() + PARSE_TIMEOUT
+    for attempt in range(2):
+        executor, future = _admit_parse(fn, args)
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except BrokenProcessPool:
+            if attempt:
+                raise
+        except FuturesTimeoutError:
+            _recycle_parse_executor(executor)
+            PARSE_REJECTIONS.inc(reason='timeout')
+            raise ParserBusy(f'Workbook took longer than {PARSE_TIMEOUT:g}s to parse')
+
+def _busy_response(error):
+    response = jsonify({'error': str(error)})
+    response.status_code = 503
+    response.headers['Retry-After'] = str(PARSE_RETRY_AFTER)
+    return response
+
+def _read_range_in_pool(source, start_row, start_col, end_row, end_col, is_xlsb, sheet=None):
+    # Ranges on several sheets read the stream once per sheet
+    source.seek(0)
+    data = source.read()
+    return submit_parse(read_excel_range_bytes, data, start_row, start_col,
+                        end_row, end_col, is_xlsb, sheet)
+
+def _read_uploaded_ranges(file, cell_ranges):
+    # Parse straight from the request's in-memory/spooled stream; nothing is
+    # written under uploads/, so concurrent uploads never share a path. The
+    # parse itself runs in the process pool so it can't hold this worker's GIL.
+    file.stream.seek(0)
+    return read_excel_ranges(file.stream, cell_ranges, use_cache=False,
+                             is_xlsb=file.filename.endswith('.xlsb'),
+                             window_reader=_read_range_in_pool)
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint; totals for all workers when METRICS_DIR is set."""
+    return app.response_class(REGISTRY.render(), mimetype=None,
+                              headers={'Content-Type': METRICS_CONTENT_TYPE})
+
+@app.route('/sheets', methods=['GET', 'POST'])
+def list_sheets():
+    """List the workbook's sheets as ``{"sheets": [{"index", "name", "rows", "cols"}]}``.
+
+    GET describes the default workbook; POST describes an uploaded ``file``. Any
+    listed name or index can be passed as ``sheet`` to the data endpoints.
+    """
+    try:
+        if request.method == 'GET':
+            if not os.path.exists(DEFAULT_FILE):
+                return jsonify({'error': f'Default file not found in {DEFAULT_FILE}'})
+            sheets = workbook_index.sheets(DEFAULT_FILE)
+        else:
+            file, error = _uploaded_workbook()
+            if error:
+                return jsonify({'error': error})
+            file.stream.seek(0)
+            sheets = submit_parse(describe_workbook_bytes, file.stream.read(),
+                                  file.filename.endswith('.xlsb'))
+        return jsonify({'sheets': sheets})
+
+    except ParserBusy as e:
+        return _busy_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)})
 
 @app.route('/get_data', methods=['POST'])
 def get_data():
-    start_cell = request.form.get('start_cell', 'A1')
-    end_cell = request.form.get('end_cell', 'A1')
     use_default = request.form.get('use_default', 'false') == 'true'
+    columnar = request.args.get('format') == 'columnar'
     
     try:
+        cell_range = _request_range(request.form)
         if use_default:
             if not os.path.exists(DEFAULT_FILE):
                 return jsonify({'error': f'Default file not found in {DEFAULT_FILE}'})
-            data = read_excel_data(DEFAULT_FILE, start_cell, end_cell)
-            return jsonify({'data': data})
-        
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file uploaded'})
-        
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'})
+            data = read_excel_ranges(DEFAULT_FILE, [cell_range])[0]
+        else:
+            file, error = _uploaded_workbook()
+            if error:
+                return jsonify({'error': error})
+            data = _read_uploaded_ranges(file, [cell_range])[0]
         
-        if not (file.filename.endswith('.xlsb') or file.filename.endswith('.xlsx')):
-            return jsonify({'error': 'Please upload an XLSB or XLSX file'})
+        if columnar:
+            data = to_columnar(data)
+        with EXCEL_PHASE_SECONDS.time(phase='serialize'):
+            return jsonify({'data': data})
+    
+    except ParserBusy as e:
+        return _busy_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)})
+
+@app.route('/get_data/batch', methods=['POST'])
+def get_data_batch():
+    """Read several ranges from one workbook in a single request.
+
+    Accepts JSON ``{"use_default": true, "ranges": [{"start_cell": "G1",
+    "end_cell": "K5"}, {"range": "A:C"}, ...]}``, or a multipart upload with
+    ``file`` plus a ``ranges`` form field holding the same JSON list. Returns ``{"data": [...]}``
+    with one grid per range, in request order; ``?format=columnar`` returns each
+    range in the compact form produced by ``to_columnar``.
+    """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {
+            'use_default': request.form.get('use_default', 'false') == 'true',
+            'ranges': request.form.get('ranges', '[]')
+        }
+    
+    try:
+        ranges = payload.get('ranges', [])
+        if isinstance(ranges, str):
+            ranges = json.loads(ranges)
+        if not isinstance(ranges, list) or not ranges:
+            return jsonify({'error': 'No ranges requested'})
+        if len(ranges) > MAX_BATCH_RANGES:
+            return jsonify({'error': f'At most {MAX_BATCH_RANGES} ranges per request'})
+        cell_ranges = _request_ranges(ranges)
         
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        if payload.get('use_default') in (True, 'true'):
+            if not os.path.exists(DEFAULT_FILE):
+                return jsonify({'error': f'Default file not found in {DEFAULT_FILE}'})
+            results = read_excel_ranges(DEFAULT_FILE, cell_ranges)
+        else:
+            file, error = _uploaded_workbook()
+            if error:
+                return jsonify({'error': error})
+            results = _read_uploaded_ranges(file, cell_ranges)
         
-        try:
-            data = read_excel_data(filepath, start_cell, end_cell)
-            return jsonify({'data': data})
-        finally:
-            if os.path.exists(filepath):
-                os.remove(filepath)
+        if request.args.get('format') == 'columnar':
+            results = [to_columnar(data) for data in results]
+        with EXCEL_PHASE_SECONDS.time(phase='serialize'):
+            return jsonify({'data': results})
     
+    except ParserBusy as e:
+        return _busy_response(e)
     except Exception as e:
+        logging.error(f"Error in get_data_batch: {str(e)}")
         return jsonify({'error': str(e)})
 
 @app.route('/certe_fresh/<path:filename>')
 def serve_certe_file(filename):
-    return send_from_directory('certe_fresh', filename)
+    # send_from_directory already answers If-None-Match/If-Modified-Since with
+    # 304s from the file's mtime/size; max_age=0 lets shared caches store it too
+    return send_from_directory('certe_fresh', filename, max_age=0)
+
+@app.route('/stream/games')
+def stream_games():
+    """Server-Sent Events feed of today's games (ET).
+
+    Sends a ``snapshot`` event with the full game list on connect (and when the
+    ET day rolls over), then ``update`` events carrying only ``added`` games and
+    the ids of ``removed`` and newly ``started`` games. A game whose details
+    change gets a new id, so it arrives as one removal and one addition.
+
+    Disabled unless GAME_STREAM is set; dashboards poll /todays_games instead.
+    """
+    if not GAME_STREAM:
+        return jsonify({'error': 'Game stream is disabled'}), 404
+    response = app.response_class(game_feed.subscribe(GAME_STREAM_MAX_SECONDS),
+                                  mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/nba_games')
 def nba_games():
     try:
         today = datetime.today().date()
-        now = datetime.now()
         next_day = today + timedelta(days=1)
 
-        schedule_file = os.path.join('uploads', 'NBA_Schedule.xlsb')
-        if not os.path.exists(schedule_file):
+        if not nba_schedule.exists():
             return jsonify({'error': 'NBA_Schedule.xlsb not found'})
 
-        df = pd.read_excel(schedule_file, engine='pyxlsb')
-        df['GameDate'] = pd.to_datetime(df['GameDate']).dt.date
-        df['GameTime'] = pd.to_datetime(df['GameTime']).dt.time
-
-        todays_games = df[df['GameDate'] == today]
-        games = todays_games if not todays_games.empty else df[df['GameDate'] == next_day]
+        game_date = today
+        schedule_day = nba_schedule.day(today)
+        if not schedule_day.games:
+            game_date = next_day
+            schedule_day = nba_schedule.day(next_day)
 
-        games = games.sort_values(by='GameTime')
+        def build_games():
+            return [
+                {
+                    'teams': f"{game.away_team} @ {game.home_team}",
+                    'datetime': game.start.strftime("%Y-%m-%d %H:%M:%S"),
+                    'start': start
+                }
+                for game, start in zip(schedule_day.games, schedule_day.starts.tolist())
+            ]
 
-        games_list = []
-        for _, row in games.iterrows():
-            game_datetime = datetime.combine(row['GameDate'], row['GameTime'])
-            countdown = (game_datetime - now).total_seconds()
-            games_list.append({
-                'teams': f"{row['AwayTeam']} @ {row['HomeTeam']}",
-                'datetime': game_datetime.strftime("%Y-%m-%d %H:%M:%S"),
-                'countdown': max(int(countdown), 0)
-            })
-
-        return jsonify(games_list)
+        return conditional_json(
+            ('nba_games', nba_schedule.fingerprint(), game_date.isoformat()),
+            _schedule_last_modified(nba_schedule, today),
+            build_games)
     except Exception as e:
         logging.error(f"Error in nba_games route: {str(e)}")
         return jsonify({'error': f'Error processing NBA games: {str(e)}'})
@@ -193,43 +1285,35 @@ def nba_games():
 def todays_games_route():
     logging.info("Today's games route hit")
     try:
-        schedule_file = os.path.join('uploads', 'NBA_Schedule_2024-25.xlsx')
-        if not os.path.exists(schedule_file):
+        schedule_file = season_schedule.path
+        if not season_schedule.exists():
             logging.error(f"Schedule file not found at: {schedule_file}")
             return jsonify({'error': f'Schedule file not found at: {schedule_file}'})
         
         try:
-            df = pd.read_excel(schedule_file, engine='openpyxl')
-            # Rename columns to match expected names
-            df = df.rename(columns={
-                'Date': 'date',
-                'Start Time (ET)': 'time',
-                'Away Team': 'away_team',
-                'Home Team': 'home_team'
-            })
-            
-            # Convert date and time to datetime
-            df['datetime'] = pd.to_datetime(df['date'].astype(str) + ' ' + df['time'].astype(str))
+            today = datetime.now(ET).date()
+            schedule_day = season_schedule.day(today)
             
-            # Filter for today's games
-            today = datetime.now(pytz.timezone('America/New_York')).date()
-            df['date'] = pd.to_datetime(df['date']).dt.date
-            todays_games = df[df['date'] == today].copy()
-            
-            # Format the output
-            games_list = []
-            for _, game in todays_games.iterrows():
-                game_time = game['datetime'].replace(tzinfo=pytz.timezone('America/New_York'))
-                games_list.append({
-                    'away_team': game['away_team'],
-                    'home_team': game['home_team'],
-                    'start_time': game['time'],
-                    'countdown': format_countdown(game_time),
-                    'tooltip': f"Game starts at {game['time']} ET"
-                })
+            def build_games():
+                # Format the output
+                games_list = [
+                    {
+                        'away_team': game.away_team,
+                        'home_team': game.home_team,
+                        'arena': game.arena,
+                        'start_time': game.start_label,
+                        'start': start,
+                        'tooltip': f"Game starts at {game.start_label} ET"
+                    }
+                    for game, start in zip(schedule_day.games, schedule_day.starts.tolist())
+                ]
+                logging.info(f"Found {len(games_list)} games for today")
+                return {'date': today.isoformat(), 'games': games_list}
             
-            logging.info(f"Found {len(games_list)} games for today")
-            return jsonify({'games': games_list})
+            return conditional_json(
+                ('todays_games', season_schedule.fingerprint(), today.isoformat()),
+                _schedule_last_modified(season_schedule, today),
+                build_games)
             
         except Exception as e:
             logging.error(f"Error processing Excel file: {str(e)}")
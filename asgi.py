@@ -0,0 +1,54 @@
+"""ASGI entry point for the Certe Flask app.
+
+Run with an ASGI server, e.g.::
+
+    uvicorn asgi:app --host 0.0.0.0 --port $PORT
+
+Flask routes run on a pool of ASGI_THREADS threads, so a slow request only
+holds its own thread and never queues the others behind it. /stream/games (when
+GAME_STREAM is enabled) is served natively on the event loop instead, so open
+streams hold no thread at all. Uploaded workbooks are parsed in app.py's
+process pool either way.
+"""
+import asyncio
+import os
+
+from a2wsgi import WSGIMiddleware
+
+import app as certe
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 8))
+SSE_HEADERS = [
+    (b'content-type', b'text/event-stream; charset=utf-8'),
+    (b'cache-control', b'no-cache'),
+    (b'x-accel-buffering', b'no'),
+]
+
+wsgi_app = WSGIMiddleware(certe.app, workers=ASGI_THREADS)
+
+async def stream_games(scope, receive, send):
+    """Event-loop version of app.stream_games, fed by the same GameFeed."""
+    disconnected = asyncio.Event()
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        disconnected.set()
+
+    watcher = asyncio.ensure_future(watch_disconnect())
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+        async for message in certe.game_feed.subscribe_async(certe.GAME_STREAM_MAX_SECONDS):
+            if disconnected.is_set():
+                return
+            await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        watcher.cancel()
+
+async def app(scope, receive, send):
+    if (scope['type'] == 'http' and scope['method'] == 'GET'
+            and scope['path'] == '/stream/games' and certe.GAME_STREAM):
+        await stream_games(scope, receive, send)
+    else:
+        await wsgi_app(scope, receive, send)
@@ -0,0 +1,66 @@
+"""Content-hashed names for static assets, built once at startup.
+
+``css/style.css`` is published as ``css/style.<hash>.css``; since the URL
+changes whenever the bytes do, hashed URLs can be cached forever. Text assets
+also get gzip/brotli variants, compressed once at the highest level and kept in
+memory.
+"""
+import hashlib
+import os
+from collections import namedtuple
+
+from compression import ENCODINGS, compress
+
+HASH_LENGTH = 10
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg', '.json', '.txt', '.html', '.map'}
+
+Asset = namedtuple('Asset', ['filename', 'digest', 'variants'])
+
+
+def _hashed_name(filename, digest):
+    stem, suffix = os.path.splitext(filename)
+    return f'{stem}.{digest}{suffix}'
+
+
+class AssetManifest:
+    """Map between the files under ``root`` and their fingerprinted names.
+
+    Paths are relative to ``root`` with forward slashes, as used by
+    ``url_for('static', filename=...)``.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._hashed = {}  # filename -> hashed name
+        self._assets = {}  # hashed name -> Asset
+        self.build()
+
+    def build(self):
+        hashed, assets = {}, {}
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                filename = os.path.relpath(path, self.root).replace(os.sep, '/')
+                with open(path, 'rb') as f:
+                    data = f.read()
+                digest = hashlib.sha1(data).hexdigest()[:HASH_LENGTH]
+                variants = {}
+                if os.path.splitext(name)[1].lower() in COMPRESSIBLE_SUFFIXES:
+                    for encoding in ENCODINGS:
+                        encoded = compress(data, encoding, best=True)
+                        if len(encoded) < len(data):
+                            variants[encoding] = encoded
+                hashed[filename] = _hashed_name(filename, digest)
+                assets[hashed[filename]] = Asset(filename, digest, variants)
+        # Publish the assets before the names that point at them, so a URL handed
+        # out mid-rebuild always resolves
+        self._assets = assets
+        self._hashed = hashed
+
+    def hashed(self, filename):
+        """The fingerprinted name for ``filename``, or ``filename`` itself if unknown."""
+        return self._hashed.get(filename, filename)
+
+    def lookup(self, hashed_name):
+        """The Asset published as ``hashed_name``, or None."""
+        return self._assets.get(hashed_name)
@@ -0,0 +1,160 @@
+"""Benchmarks for the Certe routes and Excel readers.
+
+Generates xlsx fixtures of increasing size in a scratch directory, points the
+app at them and times each case through Flask's test client, reporting
+throughput and p50/p99 latency. pyxlsb cannot write workbooks, so xlsb cases
+only run when an existing file is passed with --xlsb.
+
+    python benchmarks/run.py            # full run
+    python benchmarks/run.py --quick    # fewer rows and iterations
+    python benchmarks/run.py --xlsb "certe_fresh/Certe Beta 1.2.xlsb"
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytz
+from openpyxl import Workbook
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SCHEDULE_NAME = 'NBA_Schedule_2024-25.xlsx'
+TEAMS = ['Boston Celtics', 'New York Knicks', 'Denver Nuggets', 'Utah Jazz',
+         'Miami Heat', 'Phoenix Suns', 'Chicago Bulls', 'Orlando Magic']
+
+
+def write_grid_workbook(path, rows, cols):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    for r in range(rows):
+        ws.append([r * cols + c + 0.5 if c % 2 else f'r{r}c{c}' for c in range(cols)])
+    wb.save(path)
+
+
+def write_schedule_workbook(path, days):
+    """A season export with 8 games a day starting today (ET)."""
+    today = datetime.now(pytz.timezone('America/New_York')).date()
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(['Game Date', 'Start (ET)', 'Visitor/Neutral', 'Home/Neutral', 'Arena', 'Notes'])
+    for offset in range(days):
+        day = today + timedelta(days=offset)
+        for game in range(8):
+            hour = 12 + game
+            ws.append([day.strftime('%a, %b %d, %Y'), f'{hour - 12 or 12}:30p',
+                       TEAMS[game], TEAMS[-game - 1], f'Arena {game}', None])
+    wb.save(path)
+
+
+def measure(fn, iterations, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    total = sum(samples)
+    return {
+        'ops': iterations / total if total else float('inf'),
+        'p50': samples[len(samples) // 2],
+        'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def report(name, stats):
+    print(f"{name:<48} {stats['ops']:>10.1f} ops/s {stats['p50'] * 1e3:>10.3f} ms "
+          f"{stats['p99'] * 1e3:>10.3f} ms")
+
+
+def expect_ok(response):
+    if response.status_code != 200 or (response.is_json and 'error' in response.json):
+        raise RuntimeError(f'{response.status_code}: {response.get_data(as_text=True)[:200]}')
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Certe routes and Excel readers')
+    parser.add_argument('--quick', action='store_true', help='smaller fixtures, fewer iterations')
+    parser.add_argument('--xlsb', help='existing .xlsb workbook to include in the reader cases')
+    args = parser.parse_args()
+
+    sizes = [1000, 5000] if args.quick else [1000, 10000, 50000]
+    iterations = 20 if args.quick else 200
+    slow_iterations = 5 if args.quick else 20
+    xlsb = os.path.abspath(args.xlsb) if args.xlsb else None
+
+    workdir = tempfile.mkdtemp(prefix='certe-bench-')
+    try:
+        # app.py resolves uploads/ relative to the working directory at import
+        os.makedirs(os.path.join(workdir, 'uploads'))
+        write_schedule_workbook(os.path.join(workdir, 'uploads', SCHEDULE_NAME), 180)
+        fixtures = {}
+        for rows in sizes:
+            fixtures[rows] = os.path.join(workdir, f'grid_{rows}.xlsx')
+            write_grid_workbook(fixtures[rows], rows, 20)
+
+        os.chdir(workdir)
+        sys.path.insert(0, REPO_ROOT)
+        import logging
+        import app
+        logging.disable(logging.INFO)
+        client = app.app.test_client()
+
+        print(f"{'case':<48} {'throughput':>16} {'p50':>13} {'p99':>13}")
+        refs = [f'{col}{row}' for col in ('A', 'K', 'AZ', 'XFD') for row in (1, 50, 1048576)]
+        report('parse_cell_reference x12',
+               measure(lambda: [app.parse_cell_reference(ref) for ref in refs], iterations * 10))
+
+        shapes = [('5x5 top', 'G1', 'K5'), ('5x5 bottom', 'G{n}', 'K{m}'), ('100x20', 'A1', 'T100')]
+        workbooks = [(f'xlsx {rows} rows', path, rows) for rows, path in fixtures.items()]
+        if xlsb:
+            workbooks.append(('xlsb', xlsb, 1000))
+        for label, path, rows in workbooks:
+            for shape, start, end in shapes:
+                start, end = start.format(n=rows - 4), end.format(m=rows)
+                app.sheet_cache.clear()
+                report(f'read_excel_data {label} {shape} cached',
+                       measure(lambda: app.read_excel_data(path, start, end), iterations))
+                report(f'read_excel_data {label} {shape} uncached',
+                       measure(lambda: app.read_excel_data(path, start, end, use_cache=False),
+                               slow_iterations, warmup=1))
+
+        largest = fixtures[sizes[-1]]
+        app.DEFAULT_FILE = largest
+        for fmt in ('', '?format=columnar'):
+            report(f'POST /get_data{fmt} default 100x20', measure(lambda: expect_ok(client.post(
+                f'/get_data{fmt}', data={'use_default': 'true', 'start_cell': 'A1',
+                                         'end_cell': 'T100'})), iterations))
+        batch = {'use_default': True, 'ranges': [
+            {'start_cell': f'A{r}', 'end_cell': f'E{r + 4}'} for r in range(1, 100, 10)]}
+        report('POST /get_data/batch default 10x(5x5)',
+               measure(lambda: expect_ok(client.post('/get_data/batch', json=batch)), iterations))
+
+        with open(fixtures[sizes[0]], 'rb') as f:
+            upload = f.read()
+        report(f'POST /get_data upload {sizes[0]} rows 5x5', measure(lambda: expect_ok(client.post(
+            '/get_data', data={'start_cell': 'G1', 'end_cell': 'K5',
+                               'file': (io.BytesIO(upload), 'upload.xlsx')})), slow_iterations))
+
+        report('GET /todays_games',
+               measure(lambda: expect_ok(client.get('/todays_games')), iterations))
+        etag = client.get('/todays_games').headers['ETag']
+        report('GET /todays_games (If-None-Match)', measure(lambda: client.get(
+            '/todays_games', headers={'If-None-Match': etag}), iterations))
+        if app.nba_schedule.exists():
+            report('GET /nba_games', measure(lambda: expect_ok(client.get('/nba_games')), iterations))
+        else:
+            print(f"{'GET /nba_games':<48} skipped: needs uploads/NBA_Schedule.xlsb")
+    finally:
+        os.chdir(REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""A1-style cell and range reference parsing.
+
+Supports single cells (``G1``, ``$G$1``), ranges (``G1:K5``), whole columns
+(``G:K``) and sheet-qualified forms (``Sheet2!A1``, ``'My Sheet'!G1:K5``).
+Rows and columns are returned 0-based. Results are memoized, since dashboards
+send the same handful of references over and over, and ``parse_cell_references``
+turns a whole list of cells into row and column arrays at once.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+MAX_ROWS = 1048576
+MAX_COLS = 16384
+
+# end_row is None for whole-column ranges, meaning "to the last row of the sheet"
+CellRange = namedtuple('CellRange', ['sheet', 'start_row', 'start_col', 'end_row', 'end_col'])
+
+_CELL = re.compile(r'^\$?([A-Za-z]{1,3})\$?([0-9]+)$')
+_COLUMN = re.compile(r'^\$?([A-Za-z]{1,3})$')
+
+
+@lru_cache(maxsize=1024)
+def column_index(letters):
+    """Convert column letters to a 0-based index: ``A`` -> 0, ``AA`` -> 26."""
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - ord('A') + 1
+    if not 1 <= index <= MAX_COLS:
+        raise ValueError(f'Column out of range: {letters}')
+    return index - 1
+
+
+def column_letters(index):
+    """Convert a 0-based column index back to letters: 26 -> ``AA``."""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _split_sheet(ref):
+    ref = ref.strip()
+    if '!' not in ref:
+        return None, ref
+    sheet, _, ref = ref.rpartition('!')
+    if len(sheet) >= 2 and sheet[0] == sheet[-1] == "'":
+        sheet = sheet[1:-1].replace("''", "'")
+    if not sheet:
+        raise ValueError(f'Missing sheet name: {ref}')
+    return sheet, ref
+
+
+def _parse_cell(text, original):
+    match = _CELL.match(text)
+    if not match:
+        raise ValueError(f'Invalid cell reference: {original}')
+    row = int(match.group(2))
+    if not 1 <= row <= MAX_ROWS:
+        raise ValueError(f'Row out of range: {original}')
+    return row - 1, column_index(match.group(1))
+
+
+@lru_cache(maxsize=4096)
+def parse_range(ref):
+    """Parse ``[Sheet!]A1``, ``[Sheet!]A1:B2`` or ``[Sheet!]A:B`` into a CellRange.
+
+    The corners are normalized so start is always above and left of end.
+    """
+    sheet, text = _split_sheet(ref)
+    first, separator, last = text.partition(':')
+    if not separator:
+        last = first
+    columns = _COLUMN.match(first), _COLUMN.match(last)
+    if all(columns):
+        start_col, end_col = sorted(column_index(match.group(1)) for match in columns)
+        return CellRange(sheet, 0, start_col, None, end_col)
+    (row_a, col_a), (row_b, col_b) = _parse_cell(first, ref), _parse_cell(last, ref)
+    return CellRange(sheet, min(row_a, row_b), min(col_a, col_b),
+                     max(row_a, row_b), max(col_a, col_b))
+
+
+@lru_cache(maxsize=4096)
+def parse_cell_reference(cell_ref):
+    """Parse a plain ``A1`` reference into a 0-based (row, col) tuple."""
+    return _parse_cell(cell_ref.strip(), cell_ref)
+
+
+def parse_cell_references(refs):
+    """Parse a list of ``A1`` references into 0-based row and column arrays."""
+    parsed = [parse_cell_reference(ref) for ref in refs]
+    if not parsed:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    rows, cols = np.array(parsed, dtype=np.int64).T
+    return rows, cols
@@ -0,0 +1,37 @@
+"""HTTP content-coding helpers: Accept-Encoding negotiation and gzip/brotli encoders.
+
+brotli is optional; without the ``Brotli`` package only gzip is offered.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first; brotli is typically 15-25% smaller than gzip on JSON
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+def choose_encoding(accept_encodings):
+    """Pick the best supported coding from a werkzeug ``Accept-Encoding`` header, or None."""
+    best, best_quality = None, 0
+    for encoding in ENCODINGS:
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding, best=False):
+    """Encode ``body`` bytes with ``encoding``.
+
+    The default levels suit compressing per response; ``best=True`` trades CPU
+    for size and is meant for bodies that are compressed once and then reused.
+    """
+    if encoding == 'br':
+        return brotli.compress(body, quality=11 if best else 4)
+    if encoding == 'gzip':
+        # mtime=0 keeps the output (and any ETag derived from it) deterministic
+        return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+    raise ValueError(f'Unsupported content coding: {encoding}')
@@ -3,23 +3,36 @@ from src.signal_classifier import SignalClassifier
 from src.backtester import SignalBacktester
 from src.visualizer import SignalVisualizer
 import argparse
+import pandas as pd
 
 def main():
     parser = argparse.ArgumentParser(description='Market Signal Analysis')
     parser.add_argument('--symbol', type=str, default='AAPL', help='Stock symbol to analyze')
+    parser.add_argument('--symbols', type=str, nargs='+',
+                        help='Analyze several symbols as one panel (overrides --symbol)')
     parser.add_argument('--period', type=str, default='1y', help='Data period to analyze')
     args = parser.parse_args()
 
     # Initialize components
-    fetcher = StockDataFetcher(args.symbol)
     classifier = SignalClassifier()
     backtester = SignalBacktester()
     visualizer = SignalVisualizer()
 
     # Run analysis pipeline
-    data = fetcher.fetch_data(period=args.period)
+    if args.symbols:
+        # Long panel indexed by (symbol, Date); classified and backtested in one pass
+        data = pd.concat(
+            {symbol: StockDataFetcher(symbol).fetch_data(period=args.period) for symbol in args.symbols},
+            names=['symbol', 'Date']
+        )
+    else:
+        data = StockDataFetcher(args.symbol).fetch_data(period=args.period)
     classified_data = classifier.classify_signals(data)
     backtest_results = backtester.run_backtest(classified_data)
+    if args.symbols:
+        final_returns = backtest_results['cumulative_returns'].groupby(level='symbol').last()
+        print(final_returns.to_string())
+        print(f"Portfolio: {backtest_results['portfolio_cumulative_returns'].dropna().iloc[-1]:.4f}")
     visualizer.plot_strategy_performance(classified_data, backtest_results)
 
 if __name__ == "__main__":
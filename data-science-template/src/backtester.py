@@ -5,29 +5,79 @@ from typing import Dict, List
 class SignalBacktester:
     def __init__(self, initial_capital: float = 100000.0):
         self.initial_capital = initial_capital
-        
-    def run_backtest(self, data: pd.DataFrame) -> Dict[str, pd.Series]:
-        """Run backtest on classified signals"""
+
+    def run_backtest(self, data: pd.DataFrame, symbol_level: str = 'symbol') -> Dict[str, pd.Series]:
+        """Run backtest on classified signals
+
+        ``data`` is one symbol's bars, or a long panel indexed by a
+        (symbol, date) MultiIndex whose symbol level is ``symbol_level``. For
+        a panel, returns and cumulative returns are computed per symbol in one
+        pass, and the result also holds the equal-weighted portfolio's daily
+        and cumulative returns.
+        """
         positions = self._generate_positions(data)
-        
-        # Calculate returns
-        strategy_returns = positions * data['Returns'].shift(-1)
-        cumulative_returns = (1 + strategy_returns).cumprod()
-        
+
+        if not isinstance(data.index, pd.MultiIndex):
+            # Calculate returns
+            strategy_returns = positions * data['Returns'].shift(-1)
+            cumulative_returns = (1 + strategy_returns).cumprod()
+
+            return {
+                'positions': positions,
+                'strategy_returns': strategy_returns,
+                'cumulative_returns': cumulative_returns
+            }
+
+        date_level = [name for name in data.index.names if name != symbol_level][0]
+        next_returns = data['Returns'].groupby(level=symbol_level, sort=False).shift(-1)
+        strategy_returns = positions * next_returns
+        cumulative_returns = (1 + strategy_returns).groupby(level=symbol_level, sort=False).cumprod()
+        portfolio_returns = strategy_returns.groupby(level=date_level).mean()
+
         return {
             'positions': positions,
             'strategy_returns': strategy_returns,
-            'cumulative_returns': cumulative_returns
+            'cumulative_returns': cumulative_returns,
+            'portfolio_returns': portfolio_returns,
+            'portfolio_cumulative_returns': (1 + portfolio_returns).cumprod()
         }
-    
+
+    def run_backtest_arrays(self, returns: np.ndarray, signal_types: np.ndarray) -> Dict[str, np.ndarray]:
+        """Run backtest on a wide panel of dates x symbols arrays
+
+        Same rules as ``run_backtest``; the last date has no next-day return
+        and is NaN. Portfolio results average the symbols with equal weight.
+        """
+        returns = np.asarray(returns, dtype=float)
+        positions = self._positions_from_signals(np.asarray(signal_types))
+        next_returns = np.full_like(returns, np.nan)
+        next_returns[:-1] = returns[1:]
+        strategy_returns = positions * next_returns
+
+        # Mean over the symbols that have a return on each date
+        counts = np.sum(~np.isnan(strategy_returns), axis=1)
+        portfolio_returns = np.where(counts > 0,
+                                     np.nansum(strategy_returns, axis=1) / np.maximum(counts, 1),
+                                     np.nan)
+
+        return {
+            'positions': positions,
+            'strategy_returns': strategy_returns,
+            'cumulative_returns': self._cumulative(strategy_returns),
+            'portfolio_returns': portfolio_returns,
+            'portfolio_cumulative_returns': self._cumulative(portfolio_returns)
+        }
+
+    def _cumulative(self, returns: np.ndarray) -> np.ndarray:
+        """Compound returns along the date axis, skipping NaNs like pandas' cumprod"""
+        cumulative = np.cumprod(1 + np.nan_to_num(returns), axis=0)
+        cumulative[np.isnan(returns)] = np.nan
+        return cumulative
+
     def _generate_positions(self, data: pd.DataFrame) -> pd.Series:
         """Generate trading positions based on signals"""
-        positions = pd.Series(0, index=data.index)
-        
-        # Take contrarian positions on weak signals
-        positions[data['Signal_Type'] == 'weak'] = -1
-        
-        # Take momentum positions on strong signals
-        positions[data['Signal_Type'] == 'strong'] = 1
-        
-        return positions
+        return pd.Series(self._positions_from_signals(data['Signal_Type'].to_numpy()), index=data.index)
+
+    def _positions_from_signals(self, signal_types: np.ndarray) -> np.ndarray:
+        # Take contrarian positions on weak signals and momentum positions on strong signals
+        return np.select([signal_types == 'weak', signal_types == 'strong'], [-1, 1], default=0)
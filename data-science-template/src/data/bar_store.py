@@ -0,0 +1,276 @@
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = os.environ.get(
+    'BAR_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'bars')
+)
+# A stored history whose first bar is this much later than the requested
+# period start is treated as too short and re-fetched in full; the slack
+# covers weekends and holidays at the start of the period
+BACKFILL_TOLERANCE = pd.Timedelta(days=7)
+# Parquet schema metadata key holding the provider's first bar, once known
+FIRST_AVAILABLE_KEY = b'bar_store.first_available'
+PERIOD_OFFSETS = {
+    '1d': pd.DateOffset(days=1),
+    '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+
+def period_start(period: str, end: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """Start of a Yahoo-style period ending at ``end``; None for ``max``"""
+    if period == 'max':
+        return None
+    if period == 'ytd':
+        return end.normalize().replace(month=1, day=1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+    return end - PERIOD_OFFSETS[period]
+
+
+class BarProvider(ABC):
+    """Source of OHLCV bars indexed by timestamp.
+
+    ``fetch`` returns bars from ``start`` onwards when it is given, otherwise
+    the whole ``period``.
+    """
+
+    @abstractmethod
+    def fetch(self, symbol: str, interval: str = '1d', start: Optional[pd.Timestamp] = None,
+              period: str = '1y') -> pd.DataFrame:
+        ...
+
+    def fetch_many(self, symbols: List[str], interval: str = '1d',
+                   period: str = '1y') -> Dict[str, pd.DataFrame]:
+        """Whole-period bars for several symbols; sources with a multi-symbol
+        download override this to make one request instead of one per symbol"""
+        return {symbol: self.fetch(symbol, interval, period=period) for symbol in symbols}
+
+
+class YahooProvider(BarProvider):
+    """Bars from Yahoo Finance through yfinance"""
+
+    def fetch(self, symbol: str, interval: str = '1d', start: Optional[pd.Timestamp] = None,
+              period: str = '1y') -> pd.DataFrame:
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+        if start is not None:
+            return ticker.history(start=start, interval=interval)
+        return ticker.history(period=period, interval=interval)
+
+    def fetch_many(self, symbols: List[str], interval: str = '1d',
+                   period: str = '1y') -> Dict[str, pd.DataFrame]:
+        return yahoo_download(symbols, interval, period=period)
+
+
+def yahoo_download(symbols: List[str], interval: str = '1d', **window) -> Dict[str, pd.DataFrame]:
+    """One multi-ticker yfinance download covering ``window`` (``period=`` or
+    ``start=``/``end=``); symbols without data are left out"""
+    import yfinance as yf
+
+    # Same columns as Ticker.history: adjusted prices plus dividends/splits, on
+    # the same tz-aware index (download strips the time zone by default)
+    frame = yf.download(symbols, interval=interval, group_by='ticker', auto_adjust=True,
+                        actions=True, progress=False, threads=False, ignore_tz=False, **window)
+    downloaded = set(frame.columns.get_level_values(0)) if not frame.empty else set()
+    return {
+        symbol: frame[symbol].dropna(how='all')
+        for symbol in symbols if symbol in downloaded
+    }
+
+
+def _match_tz(stored: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """``stored`` on ``fresh``'s time zone, so the two can be concatenated.
+
+    A naive index is taken as exchange-local wall-clock time, which is what a
+    tz-stripping download stores.
+    """
+    stored_tz, fresh_tz = stored.index.tz, fresh.index.tz
+    if fresh.empty or (stored_tz is None) == (fresh_tz is None):
+        return stored
+    stored = stored.copy()
+    if fresh_tz is None:
+        stored.index = stored.index.tz_localize(None)
+    else:
+        stored.index = stored.index.tz_localize(fresh_tz)
+    return stored
+
+
+class FixtureProvider(BarProvider):
+    """Bars served from in-memory DataFrames, for tests and offline machines"""
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        self.frames = frames
+        self.calls = []
+
+    @classmethod
+    def from_directory(cls, directory: str) -> 'FixtureProvider':
+        """Load ``<SYMBOL>.csv`` files, each indexed by its first column"""
+        frames = {}
+        for name in os.listdir(directory):
+            symbol, ext = os.path.splitext(name)
+            if ext == '.csv':
+                frames[symbol] = pd.read_csv(os.path.join(directory, name),
+                                             index_col=0, parse_dates=True)
+        return cls(frames)
+
+    def fetch(self, symbol: str, interval: str = '1d', start: Optional[pd.Timestamp] = None,
+              period: str = '1y') -> pd.DataFrame:
+        self.calls.append((symbol, interval, start, period))
+        if symbol not in self.frames:
+            raise KeyError(f"No fixture data for {symbol}")
+        frame = self.frames[symbol]
+        if start is None:
+            start = period_start(period, frame.index[-1]) if len(frame) else None
+        return frame if start is None else frame[frame.index >= start]
+
+
+class BarStore:
+    """Local Parquet store of bars, one file per symbol and interval.
+
+    Files live at ``<root>/<interval>/<SYMBOL>.parquet``. ``get`` only asks the
+    provider for bars from the last stored one onwards (the last bar is
+    re-fetched, since it may have been stored while still forming), so repeat
+    runs read almost everything from disk. Periods are measured back from the
+    last stored bar, so an offline machine still gets a full period of history.
+    When a full fetch comes back shorter than asked for (``period='max'``, or
+    a recently listed symbol), its first bar is recorded in the file as the
+    earliest the provider has, and history reaching it is never backfilled.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR, provider: Optional[BarProvider] = None):
+        self.root = root
+        self.provider = provider if provider is not None else YahooProvider()
+
+    def path(self, symbol: str, interval: str = '1d') -> str:
+        return os.path.join(self.root, interval, f"{symbol.upper()}.parquet")
+
+    def read(self, symbol: str, interval: str = '1d') -> Optional[pd.DataFrame]:
+        """Stored bars for ``symbol``, or None if nothing is stored yet"""
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        return pd.read_parquet(path)
+
+    def first_available(self, symbol: str, interval: str = '1d') -> Optional[pd.Timestamp]:
+        """Earliest bar the provider has for ``symbol``, if a fetch has shown it"""
+        try:
+            metadata = pq.read_schema(self.path(symbol, interval)).metadata or {}
+        except FileNotFoundError:
+            return None
+        value = metadata.get(FIRST_AVAILABLE_KEY)
+        return pd.Timestamp(value.decode()) if value else None
+
+    def write(self, symbol: str, interval: str, data: pd.DataFrame,
+              first_available: Optional[pd.Timestamp] = None) -> None:
+        path = self.path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(data)
+        if first_available is not None:
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                FIRST_AVAILABLE_KEY: first_available.isoformat().encode()
+            })
+        # Write to a temporary file first so readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def update(self, symbol: str, interval: str = '1d', period: str = '1y') -> pd.DataFrame:
+        """Bring the stored bars up to date and return everything stored"""
+        stored = self.read(symbol, interval)
+        first_available = self.first_available(symbol, interval)
+        if stored is None or stored.empty or self._needs_backfill(stored, period, first_available):
+            try:
+                fresh = self.provider.fetch(symbol, interval, period=period)
+            except Exception as e:
+                if stored is None or stored.empty:
+                    raise
+                logger.warning(f"Could not backfill {symbol} ({interval}), using stored bars: {e}")
+                return stored
+            first_available = self._history_start(fresh, period) or first_available
+            combined = fresh if stored is None else pd.concat([_match_tz(stored, fresh), fresh])
+        else:
+            try:
+                fresh = self.provider.fetch(symbol, interval, start=stored.index[-1])
+            except Exception as e:
+                logger.warning(f"Could not refresh {symbol} ({interval}), using stored bars: {e}")
+                return stored
+            combined = pd.concat([_match_tz(stored, fresh), fresh])
+        combined = combined[~combined.index.duplicated(keep='last')].sort_index()
+        self.write(symbol, interval, combined, first_available)
+        return combined
+
+    def prefetch(self, symbols: Iterable[str], interval: str = '1d', period: str = '1y',
+                 batch_size: int = 100) -> Set[str]:
+        """Seed symbols that have nothing stored with batched provider calls.
+
+        Returns the symbols that were stored; the rest (failed batches, symbols
+        the provider returned nothing for) are left to per-symbol ``get`` calls.
+        """
+        missing = [symbol for symbol in dict.fromkeys(symbols)
+                   if not os.path.exists(self.path(symbol, interval))]
+        seeded = set()
+        for i in range(0, len(missing), batch_size):
+            batch = missing[i:i + batch_size]
+            try:
+                frames = self.provider.fetch_many(batch, interval, period)
+            except Exception as e:
+                logger.warning(f"Batch fetch of {len(batch)} symbols failed: {e}")
+                continue
+            for symbol, frame in frames.items():
+                if not frame.empty:
+                    frame = frame.sort_index()
+                    self.write(symbol, interval, frame, self._history_start(frame, period))
+                    seeded.add(symbol)
+        return seeded
+
+    def get(self, symbol: str, interval: str = '1d', period: str = '1y',
+            refresh: bool = True) -> pd.DataFrame:
+        """Bars covering ``period``; ``refresh=False`` serves only what is stored"""
+        data = self.update(symbol, interval, period) if refresh else self.read(symbol, interval)
+        if data is None or data.empty:
+            raise ValueError(f"No data stored for {symbol} ({interval})")
+        start = period_start(period, data.index[-1])
+        return data.copy() if start is None else data[data.index >= start].copy()
+
+    def _history_start(self, fresh: pd.DataFrame, period: str) -> Optional[pd.Timestamp]:
+        """First bar of a whole-period fetch if it is the provider's earliest, else None"""
+        if fresh.empty:
+            return None
+        start = period_start(period, fresh.index[-1])
+        if start is None or fresh.index[0] > start + BACKFILL_TOLERANCE:
+            return fresh.index[0]
+        return None
+
+    def _needs_backfill(self, stored: pd.DataFrame, period: str,
+                        first_available: Optional[pd.Timestamp] = None) -> bool:
+        if first_available is not None and stored.index[0] <= first_available:
+            # Already holds everything the provider has
+            return False
+        start = period_start(period, stored.index[-1])
+        if start is None:
+            # Nothing recorded yet about where the provider's history begins
+            return True
+        return stored.index[0] > start + BACKFILL_TOLERANCE
@@ -0,0 +1,92 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class FetchResult(NamedTuple):
+    """Per-symbol outcome of a multi-symbol fetch"""
+    data: Dict[str, pd.DataFrame]
+    errors: Dict[str, str]
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` calls per second, in bursts of up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def fetch_with_retry(fetch_one: Callable[[str], pd.DataFrame], symbol: str,
+                     bucket: Optional[TokenBucket] = None, retries: int = 3,
+                     backoff: float = 0.5) -> pd.DataFrame:
+    """Call ``fetch_one(symbol)``, retrying exceptions with exponential backoff.
+
+    Every attempt, including retries, takes a token from ``bucket``.
+    """
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return fetch_one(symbol)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logger.warning(f"Fetching {symbol} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def fetch_concurrently(symbols: Iterable[str], fetch_one: Callable[[str], pd.DataFrame],
+                       max_workers: int = 8, rate_limit: Optional[float] = None,
+                       retries: int = 3, backoff: float = 0.5) -> FetchResult:
+    """Fetch many symbols on a thread pool.
+
+    At most ``max_workers`` requests are in flight and, with ``rate_limit``,
+    at most that many start per second. A symbol that still fails after
+    ``retries`` retries, or returns no rows, is reported in ``errors`` and
+    the rest are returned in ``data``.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    bucket = TokenBucket(rate_limit) if rate_limit else None
+    data, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            symbol: executor.submit(fetch_with_retry, fetch_one, symbol, bucket, retries, backoff)
+            for symbol in symbols
+        }
+        for symbol, future in futures.items():
+            try:
+                frame = future.result()
+            except Exception as e:
+                errors[symbol] = str(e)
+                continue
+            if frame is None or frame.empty:
+                errors[symbol] = 'no data returned'
+            else:
+                data[symbol] = frame
+    if errors:
+        logger.warning(f"Failed to fetch {len(errors)}/{len(symbols)} symbols: {sorted(errors)}")
+    return FetchResult(data, errors)
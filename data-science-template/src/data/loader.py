@@ -1,37 +1,58 @@
-import yfinance as yf
 from datetime import datetime, timedelta
 import pandas as pd
 
-def load_market_data(symbol='SPY', period='1y', interval='1d'):
+from .bar_store import BarStore
+from .fetch_engine import fetch_concurrently
+
+def load_market_data(symbol='SPY', period='1y', interval='1d', store=None, refresh=True):
     """
-    Load market data from Yahoo Finance
+    Load market data from the local bar store, fetching only missing bars
     
     Args:
         symbol (str): Stock symbol (default: SPY)
         period (str): Data period (default: 1y)
         interval (str): Data interval (default: 1d)
+        store (BarStore): Store to read from (default: Yahoo Finance backed
+            store under data/bars)
+        refresh (bool): Fetch bars newer than the stored ones (default: True)
     
     Returns:
         pd.DataFrame: DataFrame with market data
     """
-    # Fetch data from Yahoo Finance
-    ticker = yf.Ticker(symbol)
-    df = ticker.history(period=period, interval=interval)
+    store = store if store is not None else BarStore()
+    df = store.get(symbol, interval=interval, period=period, refresh=refresh)
     
     # Prepare the data
     df = df.rename(columns={'Close': 'actual'})
     df = df[['actual']]  # Keep only the closing price for now
     
     # Handle any missing values
-    df = df.fillna(method='ffill')
+    df = df.ffill()
     
     return df
 
-def get_multiple_symbols(symbols=['SPY', 'QQQ'], period='1y', interval='1d'):
+def get_multiple_symbols(symbols=['SPY', 'QQQ'], period='1y', interval='1d', store=None,
+                         max_workers=8, rate_limit=None, batch_size=100, retries=3):
     """
-    Load data for multiple symbols
+    Load data for multiple symbols concurrently
+    
+    Symbols with nothing stored yet are downloaded in batches of
+    ``batch_size`` where the provider supports it; the rest are refreshed on
+    up to ``max_workers`` threads, starting at most ``rate_limit`` requests
+    per second. Symbols that still fail after ``retries`` retries are logged
+    and left out of the result.
+    
+    Returns:
+        dict: Symbol -> DataFrame, as returned by load_market_data
     """
-    dfs = {}
-    for symbol in symbols:
-        dfs[symbol] = load_market_data(symbol, period, interval)
-    return dfs
+    store = store if store is not None else BarStore()
+    seeded = store.prefetch(symbols, interval, period, batch_size) if batch_size else set()
+    result = fetch_concurrently(
+        symbols,
+        lambda symbol: load_market_data(symbol, period, interval, store,
+                                        refresh=symbol not in seeded),
+        max_workers=max_workers,
+        rate_limit=rate_limit,
+        retries=retries
+    )
+    return result.data
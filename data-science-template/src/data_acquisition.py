@@ -1,15 +1,16 @@
-import yfinance as yf
 import pandas as pd
 from typing import Optional
 
+from .data.bar_store import BarStore
+
 class StockDataFetcher:
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, store: Optional[BarStore] = None):
         self.symbol = symbol
+        self.store = store if store is not None else BarStore()
         
-    def fetch_data(self, period: str = "1y") -> pd.DataFrame:
-        """Fetch stock data from Yahoo Finance"""
-        stock = yf.Ticker(self.symbol)
-        data = stock.history(period=period)
+    def fetch_data(self, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
+        """Fetch stock data, reading stored bars and only downloading the missing tail"""
+        data = self.store.get(self.symbol, interval=interval, period=period)
         return self._preprocess_data(data)
     
     def _preprocess_data(self, data: pd.DataFrame) -> pd.DataFrame:
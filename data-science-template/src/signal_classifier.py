@@ -8,22 +8,42 @@ class SignalClassifier:
         self.volume_threshold = volume_threshold
     
     def classify_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Classify signals as weak or strong based on price and volume changes"""
+        """Classify signals as weak or strong based on price and volume changes
+        
+        Works on one symbol's bars or on a long multi-symbol panel (e.g. a
+        symbol/date MultiIndex): every input is per row, so the whole panel
+        is classified in one pass.
+        """
         data = data.copy()
         
         # Classify based on price movements and volume
-        data['Signal_Strength'] = self._calculate_signal_strength(data)
-        data['Signal_Type'] = np.where(
-            data['Signal_Strength'] > self.price_threshold, 
-            'strong', 
-            np.where(data['Signal_Strength'] < -self.price_threshold, 'weak', 'neutral')
-        )
+        data['Signal_Strength'] = self._calculate_signal_strength(
+            data['Returns'], data['Volume'], data['Volume_MA'])
+        data['Signal_Type'] = self._signal_types(data['Signal_Strength'].to_numpy())
         
         return data
     
-    def _calculate_signal_strength(self, data: pd.DataFrame) -> pd.Series:
+    def classify_arrays(self, returns: np.ndarray, volume: np.ndarray,
+                        volume_ma: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Classify a wide panel given as equally shaped arrays (e.g. dates x symbols)
+        
+        Returns the signal strength and signal type arrays, same shape as the inputs.
+        """
+        strength = self._calculate_signal_strength(np.asarray(returns, dtype=float),
+                                                   np.asarray(volume, dtype=float),
+                                                   np.asarray(volume_ma, dtype=float))
+        return strength, self._signal_types(strength)
+    
+    def _signal_types(self, strength: np.ndarray) -> np.ndarray:
+        return np.where(
+            strength > self.price_threshold, 
+            'strong', 
+            np.where(strength < -self.price_threshold, 'weak', 'neutral')
+        )
+    
+    def _calculate_signal_strength(self, returns, volume, volume_ma):
         """Calculate signal strength based on price and volume metrics"""
-        price_change = data['Returns'].abs()
-        volume_ratio = data['Volume'] / data['Volume_MA']
+        price_change = np.abs(returns)
+        volume_ratio = volume / volume_ma
         
         return price_change * np.log1p(volume_ratio)
@@ -10,9 +10,11 @@ class SignalVisualizer:
         """Plot strategy performance and signals"""
         plt.figure(figsize=self.figsize)
         
-        # Plot cumulative returns
+        # Plot cumulative returns (the equal-weighted portfolio for multi-symbol panels)
         plt.subplot(2, 1, 1)
-        backtest_results['cumulative_returns'].plot(title='Strategy Performance')
+        cumulative_returns = backtest_results.get('portfolio_cumulative_returns',
+                                                  backtest_results['cumulative_returns'])
+        cumulative_returns.plot(title='Strategy Performance')
         plt.ylabel('Cumulative Returns')
         
         # Plot signal distribution
@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-from scripts.fetch_market_data import fetch_market_data
+from scripts.fetch_market_data import fetch_market_data, list_symbols, read_market_data
 import plotly.express as px
 
 st.set_page_config(page_title="Stock Analysis", layout="wide")
@@ -37,11 +37,13 @@ def main():
     with tab3:
         st.header("Data Visualizer")
         try:
-            df = pd.read_csv('data/market_data.csv')
-            symbols = df['Symbol'].unique()
+            symbols = list_symbols()
+            if not symbols:
+                raise FileNotFoundError("No market data stored")
             selected_symbol = st.selectbox("Select Symbol", symbols)
             
-            symbol_data = df[df['Symbol'] == selected_symbol]
+            # Only the selected symbol's partitions and the Close column are read
+            symbol_data = read_market_data([selected_symbol], columns=['Close']).reset_index()
             fig = px.line(symbol_data, x='Date', y='Close', title=f'{selected_symbol} Price History')
             st.plotly_chart(fig)
         except Exception as e:
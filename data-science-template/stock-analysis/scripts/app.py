@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, timedelta
-from fetch_market_data import fetch_market_data
+from fetch_market_data import fetch_market_data, read_market_data
 
 st.set_page_config(page_title="Stock Market Analysis", layout="wide")
 st.title("Stock Market Analysis Dashboard")
@@ -30,13 +30,13 @@ with date_col2:
 
 if st.sidebar.button("Fetch Data"):
     with st.spinner("Fetching market data..."):
-        data_file = fetch_market_data(
+        fetch_market_data(
             symbols=symbols,
             start_date=start_date.strftime('%Y-%m-%d'),
             end_date=end_date.strftime('%Y-%m-%d')
         )
-        df = pd.read_csv(data_file, index_col=0)
-        df.index = pd.to_datetime(df.index)
+        # Read back only the selected symbols, dates and charted columns
+        df = read_market_data(symbols, start_date, end_date, columns=['Close', 'Volume'])
         
         # Price chart
         st.subheader("Stock Prices Over Time")
@@ -1,6 +1,11 @@
 import yfinance as yf
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
 
@@ -16,32 +21,221 @@ if not logger.handlers:
 # Get the absolute path to the project root
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+# Parquet dataset laid out as Symbol=<SYMBOL>/Year=<YYYY>/*.parquet
+MARKET_DATA_DIR = os.path.join(DATA_DIR, 'market_data')
+
+# stock-analysis installs and runs on its own, so it keeps its own copy of the
+# rate limiter and retry loop rather than importing the parent's src/data
+
+class TokenBucket:
+    """
+    Thread-safe rate limiter allowing `rate` requests per second in bursts of up to `capacity`
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+def _fetch_symbol(symbol, start_date, end_date, bucket, retries, backoff):
+    """
+    Fetch one symbol's history, retrying errors with exponential backoff
+    """
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return yf.Ticker(symbol).history(start=start_date, end=end_date)
+        except Exception as e:
+            if attempt == retries:
+                raise
+            delay = backoff * 2 ** attempt
+            logger.warning(f"Error fetching {symbol} ({str(e)}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+def _download_batch(symbols, start_date, end_date):
+    """
+    Fetch several symbols with one multi-ticker download; symbols without data are left out
+    """
+    # auto_adjust/actions match the columns Ticker.history returns, and
+    # ignore_tz=False keeps its exchange-local, tz-aware index
+    frame = yf.download(symbols, start=start_date, end=end_date, group_by='ticker',
+                        auto_adjust=True, actions=True, progress=False, threads=False,
+                        ignore_tz=False)
+    downloaded = set(frame.columns.get_level_values(0)) if not frame.empty else set()
+    return {
+        symbol: frame[symbol].dropna(how='all')
+        for symbol in symbols if symbol in downloaded
+    }
+
+def fetch_symbols(symbols, start_date, end_date, max_workers=8, rate_limit=5.0,
+                  retries=3, backoff=0.5, batch_size=50):
+    """
+    Fetch market data for many symbols concurrently
+    
+    Symbols are first requested in multi-ticker downloads of `batch_size`
+    (set it to 0 to skip); any a batch misses are fetched one by one on up to
+    `max_workers` threads, starting at most `rate_limit` requests per second
+    and retrying each up to `retries` times.
+    
+    Returns:
+        tuple: (dict of symbol -> DataFrame, dict of symbol -> error message)
+    """
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    data, errors = {}, {}
+    
+    if batch_size:
+        for i in range(0, len(symbols), batch_size):
+            batch = symbols[i:i + batch_size]
+            try:
+                frames = _download_batch(batch, start_date, end_date)
+            except Exception as e:
+                logger.warning(f"Batch download of {len(batch)} symbols failed: {str(e)}")
+                continue
+            data.update((symbol, df) for symbol, df in frames.items() if not df.empty)
+    
+    remaining = [symbol for symbol in symbols if symbol not in data]
+    bucket = TokenBucket(rate_limit) if rate_limit else None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            symbol: executor.submit(_fetch_symbol, symbol, start_date, end_date,
+                                    bucket, retries, backoff)
+            for symbol in remaining
+        }
+        for symbol, future in futures.items():
+            try:
+                df = future.result()
+            except Exception as e:
+                errors[symbol] = str(e)
+                logger.error(f"Error fetching {symbol}: {str(e)}")
+                continue
+            if df.empty:
+                errors[symbol] = 'no data returned'
+                logger.error(f"No data returned for {symbol}")
+            else:
+                data[symbol] = df
+    
+    logger.info(f"Fetched {len(data)}/{len(symbols)} symbols")
+    return data, errors
 
 def fetch_market_data(symbols=['SPY', 'AAPL', 'MSFT'], 
                      start_date=(datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d'),
-                     end_date=datetime.now().strftime('%Y-%m-%d')):
+                     end_date=datetime.now().strftime('%Y-%m-%d'),
+                     **fetch_options):
     """
     Fetch market data for given symbols and date range
+    
+    `fetch_options` are passed to fetch_symbols. Symbols that fail are
+    logged and left out; an error is raised only if every symbol fails.
+    """
+    logger.info(f"Starting data fetch for {len(symbols)} symbols")
+    data, errors = fetch_symbols(symbols, start_date, end_date, **fetch_options)
+    if not data:
+        raise ValueError(f"No data fetched for any symbol: {errors}")
+    
+    write_market_data(data)
+    logger.info(f"Data saved to {MARKET_DATA_DIR}")
+    return MARKET_DATA_DIR
+
+def write_market_data(data, path=MARKET_DATA_DIR):
+    """
+    Store symbol -> DataFrame bars in the partitioned Parquet dataset
+    
+    New rows are merged into the (Symbol, Year) partitions they fall in,
+    replacing stored rows with the same date; other partitions are untouched.
     """
-    logger.info(f"Starting data fetch for symbols: {symbols}")
     data_frames = []
+    for symbol, df in data.items():
+        df = df.copy()
+        # Keep exchange-local wall-clock dates; mixed time zones can't share a column
+        if df.index.tz is not None:
+            df.index = df.index.tz_localize(None)
+        df.index.name = 'Date'
+        df = df.reset_index()
+        df['Symbol'] = symbol
+        df['Year'] = df['Date'].dt.year
+        data_frames.append(df)
+    new_rows = pd.concat(data_frames, ignore_index=True)
     
-    for i, symbol in enumerate(symbols, 1):
-        logger.info(f"Fetching data for {symbol} ({i}/{len(symbols)})")
-        try:
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(start=start_date, end=end_date)
-            df['Symbol'] = symbol
-            data_frames.append(df)
-        except Exception as e:
-            logger.error(f"Error fetching {symbol}: {str(e)}")
-    
-    combined_data = pd.concat(data_frames)
-    output_file = os.path.join(DATA_DIR, 'market_data.csv')
-    os.makedirs(DATA_DIR, exist_ok=True)
-    combined_data.to_csv(output_file)
-    logger.info(f"Data saved to {output_file}")
-    return output_file
+    if list_symbols(path):
+        touched = None
+        for (symbol, year), _ in new_rows.groupby(['Symbol', 'Year']):
+            term = (ds.field('Symbol') == symbol) & (ds.field('Year') == year)
+            touched = term if touched is None else touched | term
+        stored = _dataset(path).to_table(filter=touched).to_pandas()
+        if len(stored):
+            stored['Symbol'] = stored['Symbol'].astype(str)
+            new_rows = pd.concat([stored, new_rows], ignore_index=True)
+            new_rows = new_rows.drop_duplicates(['Symbol', 'Date'], keep='last')
+    
+    table = pa.Table.from_pandas(new_rows.sort_values(['Symbol', 'Date']), preserve_index=False)
+    ds.write_dataset(table, path, format='parquet',
+                     partitioning=['Symbol', 'Year'], partitioning_flavor='hive',
+                     existing_data_behavior='delete_matching')
+
+def _dataset(path):
+    return ds.dataset(path, format='parquet', partitioning='hive')
+
+def list_symbols(path=MARKET_DATA_DIR):
+    """
+    Symbols stored in the dataset, read from the partition directory names
+    """
+    if not os.path.isdir(path):
+        return []
+    return sorted(name.split('=', 1)[1] for name in os.listdir(path) if name.startswith('Symbol='))
+
+def read_market_data(symbols=None, start_date=None, end_date=None, columns=None,
+                     path=MARKET_DATA_DIR):
+    """
+    Read a slice of the stored market data
+    
+    Symbol and year filters prune whole partition directories and the date
+    filter skips row groups, so only the requested rows and `columns` are
+    read. Dates are inclusive. Returns a DataFrame indexed by Date with a
+    Symbol column, sorted by symbol then date.
+    """
+    if not list_symbols(path):
+        raise FileNotFoundError(f"No market data stored at {path}")
+    dataset = _dataset(path)
+    schema_names = set(dataset.schema.names)
+    
+    conditions = []
+    if symbols is not None:
+        conditions.append(ds.field('Symbol').isin([symbol.upper() for symbol in symbols]))
+    if start_date is not None:
+        start = pd.Timestamp(start_date)
+        conditions.append(ds.field('Year') >= start.year)
+        conditions.append(ds.field('Date') >= start)
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        conditions.append(ds.field('Year') <= end.year)
+        conditions.append(ds.field('Date') < end.normalize() + pd.Timedelta(days=1))
+    condition = None
+    for term in conditions:
+        condition = term if condition is None else condition & term
+    
+    wanted = ['Date', 'Symbol'] + [c for c in (columns or sorted(schema_names))
+                                   if c not in ('Date', 'Symbol', 'Year')]
+    missing = [c for c in wanted if c not in schema_names]
+    if missing:
+        raise KeyError(f"Unknown columns: {missing}")
+    
+    df = dataset.to_table(columns=wanted, filter=condition).to_pandas()
+    df['Symbol'] = df['Symbol'].astype(str)
+    return df.sort_values(['Symbol', 'Date']).set_index('Date')
 
 if __name__ == "__main__":
     fetch_market_data()
@@ -1,34 +1,56 @@
 import pandas as pd
 import numpy as np
 
+# Constants from the paper
+ALPHA_THRESHOLD = 1.5  # Overreaction threshold
+BETA_THRESHOLD = 0.7   # Underreaction threshold
+
+SIGNAL_STRENGTHS = pd.CategoricalDtype(['weak', 'neutral', 'strong'])
+WEAK, NEUTRAL, STRONG = range(3)  # category codes
+
 def classify_signal_strength(data: pd.DataFrame) -> pd.Series:
     """
     Classify market signals based on price movements and sentiment
-    
+
     Parameters from paper:
     - α (alpha): overreaction coefficient for weak signals
     - β (beta): underreaction coefficient for strong signals
+
+    Returns a categorical Series of 'weak'/'neutral'/'strong'. Rows without a
+    previous bar (or with missing inputs, or right after a missing input) are
+    'neutral'.
+    """
+    return _classify(data, data[['price', 'volume']].shift())
+
+def classify_signal_strength_panel(data: pd.DataFrame, by: str = 'symbol') -> pd.Series:
     """
-    # Constants from the paper
-    ALPHA_THRESHOLD = 1.5  # Overreaction threshold
-    BETA_THRESHOLD = 0.7   # Underreaction threshold
-    
-    # Calculate signal strength based on combined metrics
-    signal_strength = pd.Series(index=data.index)
-    
-    for i in range(len(data)):
-        sentiment_score = data['sentiment_score'].iloc[i]
-        price_change = data['price'].pct_change().iloc[i]
-        volume_change = data['volume'].pct_change().iloc[i]
-        
+    Classify a multi-symbol panel in one pass
+
+    `data` holds rows for many symbols, in date order within each symbol;
+    `by` names the column or index level identifying the symbol. Price and
+    volume changes are computed within each symbol, so the first row of every
+    symbol is 'neutral', exactly as if classify_signal_strength had been run
+    on each symbol separately.
+    """
+    return _classify(data, data.groupby(by, sort=False, observed=True)[['price', 'volume']].shift())
+
+def _classify(data: pd.DataFrame, previous: pd.DataFrame) -> pd.Series:
+    # Changes against the previous bar by shift-and-divide in both entry points;
+    # pct_change would forward-fill gaps on pandas < 3 and classify them differently
+    with np.errstate(divide='ignore', invalid='ignore'):
+        price_change = data['price'].to_numpy(dtype=float) / previous['price'].to_numpy(dtype=float) - 1
+        volume_change = data['volume'].to_numpy(dtype=float) / previous['volume'].to_numpy(dtype=float) - 1
+
         # Combined signal strength metric
-        signal_magnitude = abs(sentiment_score * price_change * volume_change)
-        
-        if signal_magnitude > BETA_THRESHOLD:
-            signal_strength.iloc[i] = 'strong'
-        elif signal_magnitude < ALPHA_THRESHOLD:
-            signal_strength.iloc[i] = 'weak'
-        else:
-            signal_strength.iloc[i] = 'neutral'
-            
-    return signal_strength
\ No newline at end of file
+        signal_magnitude = np.abs(data['sentiment_score'].to_numpy(dtype=float)
+                                  * price_change * volume_change)
+
+    # Select category codes rather than strings; NaN magnitudes fail both
+    # comparisons and fall through to 'neutral'
+    codes = np.select(
+        [signal_magnitude > BETA_THRESHOLD, signal_magnitude < ALPHA_THRESHOLD],
+        [STRONG, WEAK],
+        default=NEUTRAL
+    )
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=SIGNAL_STRENGTHS),
+                     index=data.index)
@@ -0,0 +1,24 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+def make_bars(periods: int, start: str = '2024-01-01', tz: Optional[str] = None,
+              seed: Optional[int] = None) -> pd.DataFrame:
+    """Business-day OHLCV bars for the tests.
+
+    Without ``seed`` Close climbs by 1 a bar from 100 on a flat 1000 Volume, so
+    values are easy to assert on; with ``seed`` Close is a random walk and
+    Volume is random.
+    """
+    index = pd.bdate_range(start, periods=periods, tz=tz, name='Date')
+    if seed is None:
+        close = 100 + np.arange(periods, dtype=float)
+        volume = np.full(periods, 1000.0)
+    else:
+        rng = np.random.default_rng(seed)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+        volume = rng.uniform(500, 5000, periods).round()
+    return pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close, 'Volume': volume
+    }, index=index)
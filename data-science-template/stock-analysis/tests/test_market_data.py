@@ -1,9 +1,14 @@
 import unittest
+from unittest import mock
 from datetime import datetime, timedelta
 import sys
 import os
+import tempfile
+import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from scripts.fetch_market_data import fetch_market_data
+from scripts.fetch_market_data import (fetch_market_data, fetch_symbols, list_symbols,
+                                       read_market_data, write_market_data)
+from tests.helpers import make_bars
 
 class TestMarketData(unittest.TestCase):
     def test_fetch_market_data(self):
@@ -14,6 +19,45 @@ class TestMarketData(unittest.TestCase):
             end_date=datetime.now().strftime('%Y-%m-%d')
         )
         self.assertTrue(os.path.exists(result))
+    
+    def test_fetch_symbols_reports_partial_failures(self):
+        # Offline: the batch download misses MSFT and BAD, which are then
+        # fetched one by one; BAD keeps failing and is reported
+        frame = pd.DataFrame({'Close': [1.0, 2.0]}, index=pd.date_range('2024-01-02', periods=2))
+        batch = pd.concat({'SPY': frame}, axis=1)
+        
+        def history(ticker, start=None, end=None):
+            if ticker.ticker == 'BAD':
+                raise ConnectionError('connection reset')
+            return frame
+        
+        with mock.patch('scripts.fetch_market_data.yf.download', return_value=batch), \
+                mock.patch('scripts.fetch_market_data.yf.Ticker.history', autospec=True,
+                           side_effect=history) as single:
+            data, errors = fetch_symbols(['SPY', 'MSFT', 'BAD'], '2024-01-01', '2024-01-05',
+                                         retries=1, backoff=0)
+        
+        self.assertEqual(set(data), {'SPY', 'MSFT'})
+        self.assertEqual(list(errors), ['BAD'])
+        self.assertEqual(single.call_count, 3)
+    
+    def test_partitioned_dataset_round_trip(self):
+        def bars(start, periods):
+            return make_bars(periods, start=start, tz='America/New_York')[['Close', 'Volume']]
+        
+        with tempfile.TemporaryDirectory() as path:
+            write_market_data({'SPY': bars('2023-12-01', 40), 'AAPL': bars('2024-01-02', 10)}, path)
+            # A later fetch overlapping stored dates replaces just those rows
+            write_market_data({'SPY': bars('2024-01-15', 10) + 100}, path)
+            
+            self.assertEqual(list_symbols(path), ['AAPL', 'SPY'])
+            self.assertEqual(sorted(os.listdir(os.path.join(path, 'Symbol=SPY'))),
+                             ['Year=2023', 'Year=2024'])
+            
+            df = read_market_data(['spy'], '2024-01-12', '2024-01-16', columns=['Close'], path=path)
+            self.assertEqual(list(df.columns), ['Symbol', 'Close'])
+            self.assertEqual(df['Close'].tolist(), [130.0, 200.0, 201.0])
+            self.assertEqual(len(read_market_data(path=path)), 40 + 1 + 10)
         
 if __name__ == '__main__':
     unittest.main()
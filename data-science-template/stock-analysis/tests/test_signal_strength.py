@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+from src.models.signal_classifier import (classify_signal_strength,
+                                          classify_signal_strength_panel)
+from tests.helpers import make_bars
+
+def reference_classification(data):
+    """Row-by-row version of the classification rules"""
+    price_change = data['price'] / data['price'].shift() - 1
+    volume_change = data['volume'] / data['volume'].shift() - 1
+    labels = []
+    for i in range(len(data)):
+        magnitude = abs(data['sentiment_score'].iloc[i] * price_change.iloc[i] * volume_change.iloc[i])
+        if magnitude > 0.7:
+            labels.append('strong')
+        elif magnitude < 1.5:
+            labels.append('weak')
+        else:
+            labels.append('neutral')
+    return labels
+
+def signal_inputs(periods, seed=0):
+    bars = make_bars(periods, seed=seed).reset_index(drop=True)
+    return pd.DataFrame({
+        'price': bars['Close'],
+        'volume': bars['Volume'],
+        'sentiment_score': np.random.default_rng(seed).uniform(-1, 1, periods)
+    })
+
+def test_matches_row_by_row_rules():
+    data = signal_inputs(200)
+    data.loc[10, 'price'] = np.nan
+    data.loc[20, 'volume'] = 0
+    
+    signals = classify_signal_strength(data)
+    
+    assert isinstance(signals.dtype, pd.CategoricalDtype)
+    assert signals.index.equals(data.index)
+    assert signals.astype(str).tolist() == reference_classification(data)
+    assert signals.iloc[0] == 'neutral'
+
+def test_panel_matches_per_symbol_classification():
+    frames = {symbol: signal_inputs(50, seed)
+              for seed, symbol in enumerate(['SPY', 'AAPL', 'MSFT'])}
+    panel = pd.concat(frames, names=['symbol', 'row'])
+    
+    signals = classify_signal_strength_panel(panel, by='symbol')
+    
+    for symbol, frame in frames.items():
+        assert signals.loc[symbol].astype(str).tolist() == reference_classification(frame)
+
+def test_panel_matches_per_symbol_classification_with_gaps():
+    frames = {symbol: signal_inputs(50, seed)
+              for seed, symbol in enumerate(['SPY', 'AAPL', 'MSFT'])}
+    for offset, frame in enumerate(frames.values()):
+        frame.loc[5 + offset, 'price'] = np.nan
+        frame.loc[[20, 21 + offset], 'volume'] = np.nan
+    panel = pd.concat(frames, names=['symbol', 'row'])
+    
+    signals = classify_signal_strength_panel(panel, by='symbol')
+    
+    for offset, (symbol, frame) in enumerate(frames.items()):
+        expected = classify_signal_strength(frame)
+        assert signals.loc[symbol].tolist() == expected.tolist()
+        # The bar after a gap has no previous value to compare against
+        assert expected.iloc[6 + offset] == 'neutral'
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.signal_classifier import SignalClassifier
+from src.backtester import SignalBacktester
+from tests.helpers import make_bars
+
+class TestPanelBacktest(unittest.TestCase):
+    def setUp(self):
+        self.classifier = SignalClassifier()
+        self.backtester = SignalBacktester()
+        self.frames = {}
+        for seed, symbol in enumerate(['SPY', 'QQQ', 'AAPL']):
+            bars = make_bars(60, seed=seed)
+            self.frames[symbol] = pd.DataFrame({
+                'Returns': bars['Close'].pct_change().fillna(0),
+                'Volume': bars['Volume'],
+                'Volume_MA': 2000.0
+            })
+        self.panel = pd.concat(self.frames, names=['symbol', 'Date'])
+        
+    def test_panel_matches_single_symbol_runs(self):
+        results = self.backtester.run_backtest(self.classifier.classify_signals(self.panel))
+        
+        for symbol, frame in self.frames.items():
+            single = self.backtester.run_backtest(self.classifier.classify_signals(frame))
+            for key in ('positions', 'strategy_returns', 'cumulative_returns'):
+                pd.testing.assert_series_equal(results[key].loc[symbol], single[key],
+                                               check_names=False, check_freq=False)
+        
+        expected = pd.concat({s: self.backtester.run_backtest(self.classifier.classify_signals(f))
+                              ['strategy_returns'] for s, f in self.frames.items()}, axis=1).mean(axis=1)
+        pd.testing.assert_series_equal(results['portfolio_returns'], expected,
+                                       check_names=False, check_freq=False)
+        
+    def test_wide_arrays_match_long_panel(self):
+        wide = {column: np.column_stack([f[column].to_numpy() for f in self.frames.values()])
+                for column in ('Returns', 'Volume', 'Volume_MA')}
+        strength, signal_types = self.classifier.classify_arrays(
+            wide['Returns'], wide['Volume'], wide['Volume_MA'])
+        results = self.backtester.run_backtest_arrays(wide['Returns'], signal_types)
+        long_results = self.backtester.run_backtest(self.classifier.classify_signals(self.panel))
+        
+        self.assertEqual(strength.shape, (60, 3))
+        np.testing.assert_allclose(results['cumulative_returns'][:, 1],
+                                   long_results['cumulative_returns'].loc['QQQ'].to_numpy())
+        np.testing.assert_allclose(results['portfolio_cumulative_returns'],
+                                   long_results['portfolio_cumulative_returns'].to_numpy())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import tempfile
+import unittest
+import pandas as pd
+from src.data.bar_store import BarProvider, BarStore, FixtureProvider
+from src.data_acquisition import StockDataFetcher
+from tests.helpers import make_bars
+
+class TestBarStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bars = make_bars(400, start='2023-01-02', tz='America/New_York')
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def test_repeat_get_only_fetches_the_tail(self):
+        provider = FixtureProvider({'SPY': self.bars.iloc[:300]})
+        store = BarStore(self.tmp.name, provider)
+        first = store.get('SPY', period='1y')
+        
+        provider.frames['SPY'] = self.bars
+        second = store.get('SPY', period='1y')
+        
+        self.assertIsNone(provider.calls[0][2])
+        self.assertEqual(provider.calls[1][2], first.index[-1])
+        self.assertEqual(second.index[-1], self.bars.index[-1])
+        self.assertTrue(second.index.is_unique)
+        self.assertEqual(len(store.read('SPY')), len(first) + 100)
+        
+    def test_stored_bars_served_when_provider_fails(self):
+        store = BarStore(self.tmp.name, FixtureProvider({'SPY': self.bars}))
+        expected = store.get('SPY', period='6mo')
+        
+        offline = BarStore(self.tmp.name, FixtureProvider({}))
+        pd.testing.assert_frame_equal(offline.get('SPY', period='6mo'), expected, check_freq=False)
+        
+    def test_stored_bars_served_when_backfill_fails(self):
+        store = BarStore(self.tmp.name, FixtureProvider({'SPY': self.bars}))
+        expected = store.get('SPY', period='1mo')
+        
+        offline = BarStore(self.tmp.name, FixtureProvider({}))
+        with self.assertLogs('src.data.bar_store', 'WARNING'):
+            data = offline.get('SPY', period='1y')
+        
+        pd.testing.assert_frame_equal(data, expected, check_freq=False)
+        
+    def test_failed_first_fetch_raises(self):
+        store = BarStore(self.tmp.name, FixtureProvider({}))
+        
+        with self.assertRaises(KeyError):
+            store.get('SPY', period='1y')
+        
+    def test_short_history_is_backfilled(self):
+        provider = FixtureProvider({'SPY': self.bars})
+        store = BarStore(self.tmp.name, provider)
+        store.get('SPY', period='1mo')
+        data = store.get('SPY', period='1y')
+        
+        self.assertEqual(provider.calls[1][2:], (None, '1y'))
+        self.assertGreater(len(data), 250)
+        
+    def test_max_period_only_fetches_the_tail(self):
+        provider = FixtureProvider({'SPY': self.bars.iloc[:300]})
+        store = BarStore(self.tmp.name, provider)
+        store.get('SPY', period='max')
+        
+        provider.frames['SPY'] = self.bars
+        data = store.get('SPY', period='max')
+        
+        self.assertEqual(provider.calls[1][2], self.bars.index[299])
+        self.assertEqual(store.first_available('SPY'), self.bars.index[0])
+        self.assertEqual(len(data), len(self.bars))
+        
+    def test_recent_listing_is_not_backfilled_again(self):
+        provider = FixtureProvider({'IPO': self.bars.iloc[-60:]})
+        store = BarStore(self.tmp.name, provider)
+        store.get('IPO', period='1y')
+        store.get('IPO', period='1y')
+        
+        self.assertEqual(provider.calls[1][2], self.bars.index[-1])
+        
+    def test_provider_must_implement_fetch(self):
+        class NoFetch(BarProvider):
+            pass
+        
+        with self.assertRaises(TypeError):
+            NoFetch()
+        
+    def test_fetcher_reads_through_store(self):
+        store = BarStore(self.tmp.name, FixtureProvider({'AAPL': self.bars}))
+        data = StockDataFetcher('AAPL', store).fetch_data(period='1y')
+        
+        self.assertTrue({'Returns', 'Volume_MA', 'Price_MA'} <= set(data.columns))
+        self.assertFalse(data.isna().any().any())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+import pandas as pd
+from src.data.bar_store import BarStore, FixtureProvider, YahooProvider
+from src.data.fetch_engine import TokenBucket, fetch_concurrently
+from src.data.loader import get_multiple_symbols
+from tests.helpers import make_bars
+
+class FakeYahoo:
+    """Stands in for the yfinance module with the time zone behaviour of the real
+    calls: download() strips it from daily bars unless ignore_tz=False, while
+    Ticker.history() always returns exchange-local, tz-aware bars"""
+    
+    def __init__(self, frames):
+        self.frames = frames
+        
+    def download(self, symbols, interval='1d', ignore_tz=None, **kwargs):
+        frame = pd.concat({s: self.frames[s] for s in symbols if s in self.frames}, axis=1)
+        if ignore_tz is not False:
+            frame.index = frame.index.tz_localize(None)
+        return frame
+        
+    def Ticker(self, symbol):
+        frame = self.frames[symbol]
+        
+        class Ticker:
+            def history(self, start=None, period=None, interval='1d'):
+                if start is None:
+                    return frame
+                start = pd.Timestamp(start)
+                if start.tz is None:
+                    start = start.tz_localize(frame.index.tz)
+                return frame[frame.index >= start]
+        
+        return Ticker()
+
+class TestFetchEngine(unittest.TestCase):
+    def test_partial_failures_are_reported(self):
+        attempts = {}
+        
+        def fetch_one(symbol):
+            attempts[symbol] = attempts.get(symbol, 0) + 1
+            if symbol == 'FLAKY' and attempts[symbol] < 3:
+                raise ConnectionError('reset')
+            if symbol == 'BAD':
+                raise KeyError(symbol)
+            if symbol == 'EMPTY':
+                return pd.DataFrame()
+            return make_bars(5)
+        
+        result = fetch_concurrently(['SPY', 'FLAKY', 'BAD', 'EMPTY'], fetch_one,
+                                    max_workers=4, retries=2, backoff=0)
+        
+        self.assertEqual(set(result.data), {'SPY', 'FLAKY'})
+        self.assertEqual(set(result.errors), {'BAD', 'EMPTY'})
+        self.assertEqual(attempts['BAD'], 3)
+        self.assertEqual(attempts['EMPTY'], 1)
+        
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        for _ in range(11):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+        
+    def test_multiple_symbols_seeded_in_one_batch(self):
+        class CountingProvider(FixtureProvider):
+            def fetch_many(self, symbols, interval='1d', period='1y'):
+                self.batches.append(list(symbols))
+                return super().fetch_many([s for s in symbols if s in self.frames], interval, period)
+        
+        provider = CountingProvider({'SPY': make_bars(300), 'QQQ': make_bars(300)})
+        provider.batches = []
+        with tempfile.TemporaryDirectory() as root:
+            store = BarStore(root, provider)
+            data = get_multiple_symbols(['SPY', 'QQQ', 'NOPE'], store=store, max_workers=2,
+                                        retries=1)
+            
+            self.assertEqual(provider.batches, [['SPY', 'QQQ', 'NOPE']])
+            self.assertEqual(set(data), {'SPY', 'QQQ'})
+            self.assertEqual(list(data['SPY'].columns), ['actual'])
+            # Only the symbol missing from the batch was fetched on its own
+            self.assertEqual([call[0] for call in provider.calls if call[0] == 'NOPE'], ['NOPE'] * 2)
+
+class TestYahooTimeZones(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bars = make_bars(300, tz='America/New_York')
+        patcher = mock.patch.dict(sys.modules, {'yfinance': FakeYahoo({'SPY': self.bars, 'QQQ': self.bars})})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+    def tearDown(self):
+        self.tmp.cleanup()
+        
+    def test_batch_seeded_store_can_be_refreshed(self):
+        store = BarStore(self.tmp.name, YahooProvider())
+        first = get_multiple_symbols(['SPY', 'QQQ'], store=store, max_workers=2, retries=0)
+        second = get_multiple_symbols(['SPY', 'QQQ'], store=store, max_workers=2, retries=0)
+        
+        self.assertEqual(set(first), {'SPY', 'QQQ'})
+        self.assertEqual(set(second), {'SPY', 'QQQ'})
+        self.assertEqual(str(store.read('SPY').index.tz), 'America/New_York')
+        
+    def test_store_seeded_without_time_zone_is_updated(self):
+        store = BarStore(self.tmp.name, YahooProvider())
+        naive = self.bars.iloc[:200].copy()
+        naive.index = naive.index.tz_localize(None)
+        store.write('SPY', '1d', naive)
+        
+        data = store.update('SPY', period='6mo')
+        
+        self.assertEqual(len(data), len(self.bars))
+        self.assertTrue(data.index.is_unique)
+        self.assertEqual(str(data.index.tz), 'America/New_York')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Workbook parsing helpers shared by app.py and its parse worker processes.
+
+This module only depends on pyxlsb and openpyxl, so process-pool workers can
+import it without loading the Flask app or its preloaded data.
+"""
+from io import BytesIO
+
+from pyxlsb import open_workbook
+from openpyxl import load_workbook
+
+
+def find_sheet(names, sheet):
+    """Return the 1-based position of ``sheet`` among the workbook's sheet ``names``.
+
+    ``sheet`` is a sheet name, matched case-insensitively, or a 1-based index
+    string; None selects the first sheet.
+    """
+    if sheet is None:
+        return 1
+    lowered = [name.lower() for name in names]
+    if str(sheet).lower() in lowered:
+        return lowered.index(str(sheet).lower()) + 1
+    if str(sheet).isdigit() and 1 <= int(sheet) <= len(names):
+        return int(sheet)
+    raise ValueError(f'Sheet not found: {sheet}')
+
+
+def load_sheet_grid(filepath, sheet=None):
+    """Decode one worksheet (the first by default) into lists of raw cell values."""
+    if filepath.endswith('.xlsb'):
+        with open_workbook(filepath) as wb:
+            with wb.get_sheet(find_sheet(wb.sheets, sheet)) as ws:
+                return [[cell.v for cell in row] for row in ws.rows()]
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[find_sheet(wb.sheetnames, sheet) - 1]
+        return [list(row) for row in ws.iter_rows(values_only=True)]
+    finally:
+        wb.close()
+
+
+def describe_workbook(source, is_xlsb=None):
+    """List each sheet's 1-based index, name and declared dimensions.
+
+    Dimensions come from the sheet's dimension record, so no cell data is read;
+    ``rows``/``cols`` are None when the file doesn't declare them.
+    """
+    if is_xlsb is None:
+        is_xlsb = source.endswith('.xlsb')
+    sheets = []
+    if is_xlsb:
+        with open_workbook(source) as wb:
+            for index, name in enumerate(wb.sheets, 1):
+                with wb.get_sheet(index) as ws:
+                    dim = ws.dimension
+                sheets.append({
+                    'index': index,
+                    'name': name,
+                    'rows': dim.r + dim.h if dim else None,
+                    'cols': dim.c + dim.w if dim else None
+                })
+        return sheets
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        for index, ws in enumerate(wb.worksheets, 1):
+            sheets.append({
+                'index': index,
+                'name': ws.title,
+                'rows': ws.max_row,
+                'cols': ws.max_column
+            })
+    finally:
+        wb.close()
+    return sheets
+
+
+def describe_workbook_bytes(data, is_xlsb):
+    """``describe_workbook`` over an in-memory workbook; a process-pool entry point."""
+    return describe_workbook(BytesIO(data), is_xlsb)
+
+
+def read_excel_range(source, start_row, start_col, end_row, end_col, is_xlsb=None, sheet=None):
+    """Read only the 0-based, inclusive rectangle of one worksheet.
+
+    ``source`` is a path or a seekable binary file object; for file objects
+    ``is_xlsb`` must say which format to parse. ``sheet`` is a sheet name or
+    1-based index string and defaults to the first sheet. The xlsb reader stops
+    as soon as it passes ``end_row`` and the xlsx reader lets openpyxl skip
+    everything outside the requested rows and columns, so the cost scales with
+    the window rather than the sheet.
+    """
+    if is_xlsb is None:
+        is_xlsb = source.endswith('.xlsb')
+    window = []
+    if is_xlsb:
+        with open_workbook(source) as wb:
+            ws = wb.get_sheet(find_sheet(wb.sheets, sheet))
+            with ws:
+                for row_idx, row in enumerate(ws.rows()):
+                    if row_idx > end_row:
+                        break
+                    if row_idx >= start_row:
+                        window.append([cell.v for cell in row[start_col:end_col + 1]])
+        return window
+
+    wb = load_workbook(source, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[find_sheet(wb.sheetnames, sheet) - 1]
+        rows = ws.iter_rows(min_row=start_row + 1, max_row=end_row + 1,
+                            min_col=start_col + 1, max_col=end_col + 1,
+                            values_only=True)
+        window = [list(row) for row in rows]
+    finally:
+        wb.close()
+    return window
+
+
+def read_excel_range_bytes(data, start_row, start_col, end_row, end_col, is_xlsb, sheet=None):
+    """``read_excel_range`` over an in-memory workbook; a process-pool entry point."""
+    return read_excel_range(BytesIO(data), start_row, start_col, end_row, end_col, is_xlsb, sheet)
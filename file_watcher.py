@@ -0,0 +1,177 @@
+"""Background watcher that reports changed files in a set of directories.
+
+Uses inotify through ctypes where the C library provides it, so there is no
+dependency to install, and falls back to polling mtimes elsewhere.
+"""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+# inotify(7) constants, from <sys/inotify.h>
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_IGNORED = 0x8000
+IN_ONLYDIR = 0x1000000
+IN_MASK_ADD = 0x20000000
+IN_ISDIR = 0x40000000
+IN_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+
+class FileWatcher:
+    """Daemon thread that reports changed workbooks under ``directories``.
+
+    Uses inotify where the C library provides it and otherwise polls mtimes
+    every ``poll_interval`` seconds. Changes are collected until ``debounce``
+    seconds pass without another one, then ``on_change`` is called with the set
+    of changed paths, so a file written in several chunks is reloaded once.
+    With inotify the parent of each directory is watched too, so a directory
+    created (or deleted and recreated) after startup is picked up.
+    The thread is per process and started on first use.
+    """
+
+    def __init__(self, directories, suffixes, on_change, poll_interval, debounce):
+        self.directories = directories
+        self.suffixes = suffixes
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._pid = None
+        self._libc = None
+        self._directory_by_wd = {}
+        self._children_by_wd = {}  # parent wd -> {directory basename: directory}
+
+    def start(self):
+        """Start the thread unless this process already has one; True if it started."""
+        with self._lock:
+            if self._pid == os.getpid():
+                return False
+            self._pid = os.getpid()
+        threading.Thread(target=self._run, name='file-watcher', daemon=True).start()
+        return True
+
+    def _matches(self, name):
+        return name.endswith(self.suffixes) and not name.startswith('~$')
+
+    def _run(self):
+        try:
+            fd = self._inotify_fd()
+        except OSError as e:
+            logging.info(f"inotify unavailable ({str(e)}), polling for file changes")
+            self._poll_loop()
+        else:
+            self._inotify_loop(fd)
+
+    def _inotify_fd(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('not supported on this platform')
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._libc = libc
+        try:
+            for directory in self.directories:
+                parent, name = os.path.split(os.path.abspath(directory))
+                wd = self._add_watch(fd, parent, IN_CREATE | IN_MOVED_TO | IN_ONLYDIR)
+                self._children_by_wd.setdefault(wd, {})[name] = directory
+                if os.path.isdir(directory):
+                    self._watch_directory(fd, directory)
+        except OSError:
+            os.close(fd)
+            raise
+        return fd
+
+    def _add_watch(self, fd, path, mask):
+        # IN_MASK_ADD so a path watched both as a directory and as a parent keeps both masks
+        wd = self._libc.inotify_add_watch(fd, os.fsencode(path), mask | IN_MASK_ADD)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {path}')
+        return wd
+
+    def _watch_directory(self, fd, directory):
+        mask = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+        self._directory_by_wd[self._add_watch(fd, directory, mask)] = directory
+
+    def _directory_created(self, fd, directory):
+        """Start watching a directory that appeared after startup; return the
+        workbooks already in it, which were written before the watch existed."""
+        try:
+            self._watch_directory(fd, directory)
+            names = os.listdir(directory)
+        except OSError as e:
+            logging.error(f"Could not watch {directory}: {str(e)}")
+            return set()
+        logging.info(f"Watching {directory}")
+        return {os.path.join(directory, name) for name in names if self._matches(name)}
+
+    def _inotify_loop(self, fd):
+        changed = set()
+        while True:
+            readable, _, _ = select.select([fd], [], [], self.debounce if changed else None)
+            if not readable:
+                self._dispatch(changed)
+                changed = set()
+                continue
+            data = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = IN_EVENT_HEADER.unpack_from(data, offset)
+                offset += IN_EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+                offset += length
+                if mask & IN_IGNORED:
+                    # The directory was deleted; its parent watch re-arms it if it returns
+                    self._directory_by_wd.pop(wd, None)
+                elif mask & IN_ISDIR:
+                    directory = self._children_by_wd.get(wd, {}).get(name)
+                    if directory is not None and mask & (IN_CREATE | IN_MOVED_TO):
+                        changed |= self._directory_created(fd, directory)
+                elif self._matches(name) and wd in self._directory_by_wd:
+                    changed.add(os.path.join(self._directory_by_wd[wd], name))
+
+    def _scan(self):
+        found = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                if self._matches(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def _poll_loop(self):
+        previous = self._scan()
+        changed = set()
+        while True:
+            time.sleep(self.debounce if changed else self.poll_interval)
+            current = self._scan()
+            new = {path for path in previous.keys() | current.keys()
+                   if previous.get(path) != current.get(path)}
+            previous = current
+            if new:
+                changed |= new
+            elif changed:
+                self._dispatch(changed)
+                changed = set()
+
+    def _dispatch(self, changed):
+        try:
+            self.on_change(changed)
+        except Exception as e:
+            logging.error(f"Error reloading {sorted(changed)}: {str(e)}")
@@ -0,0 +1,24 @@
+# Gunicorn reads this file from the working directory for both the Procfile
+# and the railway.json start command.
+import gc
+import os
+import shutil
+import tempfile
+
+# Import app.py (and with it the preloaded schedules and default workbook) once
+# in the master, so forked workers share that memory copy-on-write instead of
+# each holding its own copy.
+preload_app = True
+
+# Workers publish their metrics here, so /metrics reports the totals of all
+# workers whichever one serves the scrape. Set before app.py is imported, and
+# emptied so counters from a previous run aren't added to this one's.
+METRICS_DIR = os.environ.setdefault(
+    'METRICS_DIR', os.path.join(tempfile.gettempdir(), 'certe-metrics'))
+shutil.rmtree(METRICS_DIR, ignore_errors=True)
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # collections in the workers don't write to (and thereby copy) shared pages.
+    gc.freeze()
@@ -0,0 +1,287 @@
+"""Minimal in-process metrics exposed in the Prometheus text format.
+
+Each process records into its own registry. Behind one port, though, a scrape
+lands on whichever gunicorn worker accepts it, so per-process values would
+jump between workers from scrape to scrape. When the registry is given a
+shared directory (METRICS_DIR), every process publishes its values there as
+``<pid>.json`` and ``render`` reports the whole server: counters and
+histograms summed over every process that has run, including exited workers
+so totals never go backwards, and gauges as one series per live process,
+labelled ``pid``.
+"""
+import atexit
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PUBLISH_INTERVAL = 1  # seconds between a process's writes to the shared directory
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def snapshot(self):
+        """Return a copy of the current values, safe to read without the lock."""
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    def render(self, values=None, labelnames=None):
+        """Render ``values`` (this process's own by default) in the text format."""
+        if values is None:
+            values = self.snapshot()
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._samples(values, labelnames or self.labelnames))
+        return lines
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def _add(total, value):
+        return total + value
+
+    @staticmethod
+    def _subtract(value, baseline):
+        return value - baseline
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self, values, labelnames):
+        return [
+            f'{self.name}{_format_labels(labelnames, key)} {_format_value(value)}'
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    _samples = Counter._samples
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    @staticmethod
+    def _copy(value):
+        counts, total = value
+        return list(counts), total
+
+    @staticmethod
+    def _add(total, value):
+        return [a + b for a, b in zip(total[0], value[0])], total[1] + value[1]
+
+    @staticmethod
+    def _subtract(value, baseline):
+        return [a - b for a, b in zip(value[0], baseline[0])], value[1] - baseline[1]
+
+    def _samples(self, values, labelnames):
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(labelnames, key, [('le', le)])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    """The metrics of one process, optionally shared through ``directory``.
+
+    With a directory, a daemon thread publishes this process's values every
+    ``publish_interval`` seconds (and once more at exit), and ``render`` reports
+    what all processes last published. A forked child starts
+    its own publisher and only publishes what it recorded after the fork, so
+    values inherited from a preloading master are not counted twice.
+    """
+
+    def __init__(self, directory=None, publish_interval=PUBLISH_INTERVAL):
+        self._metrics = []
+        self.directory = directory
+        self.publish_interval = publish_interval
+        self._baseline = {}
+        if directory:
+            self._start_publisher()
+            os.register_at_fork(after_in_child=self._after_fork)
+            atexit.register(self._publish_quietly)
+
+    def counter(self, *args, **kwargs):
+        return self._register(Counter(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs):
+        return self._register(Gauge(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self._register(Histogram(*args, **kwargs))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        if not self.directory:
+            return self._render({metric.name: metric.snapshot() for metric in self._metrics})
+        # Only published values are read, this process's included: publishing
+        # fresh ones here while other workers' files lag would let a total
+        # drop on the next scrape served by another worker
+        return self._render(self._collect(), gauge_labels=('pid',))
+
+    def _render(self, values, gauge_labels=()):
+        lines = []
+        for metric in self._metrics:
+            labelnames = metric.labelnames + gauge_labels if metric.kind == 'gauge' else None
+            lines.extend(metric.render(values.get(metric.name, {}), labelnames))
+        return '\n'.join(lines) + '\n'
+
+    def publish(self):
+        """Write this process's values to ``<directory>/<pid>.json``."""
+        payload = {}
+        for metric in self._metrics:
+            baseline = {} if metric.kind == 'gauge' else self._baseline.get(metric.name, {})
+            payload[metric.name] = [
+                [list(key), metric._subtract(value, baseline[key]) if key in baseline else value]
+                for key, value in metric.snapshot().items()
+            ]
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, suffix='.tmp', delete=False) as tmp:
+            json.dump(payload, tmp)
+        try:
+            os.replace(tmp.name, os.path.join(self.directory, f'{os.getpid()}.json'))
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+    def _collect(self):
+        """Merge every published file into {metric name: {label values: value}}."""
+        kinds = {metric.name: metric for metric in self._metrics}
+        merged = {name: {} for name in kinds}
+        for filename in os.listdir(self.directory):
+            pid, extension = os.path.splitext(filename)
+            if extension != '.json' or not pid.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    published = json.load(f)
+            except (OSError, ValueError):
+                continue
+            live = None
+            for name, samples in published.items():
+                metric = kinds.get(name)
+                if metric is None:
+                    continue
+                values = merged[name]
+                if metric.kind == 'gauge':
+                    # A gauge is a current reading, meaningless once its process exits
+                    if live is None:
+                        live = _alive(int(pid))
+                    if live:
+                        values.update((tuple(key) + (pid,), value) for key, value in samples)
+                    continue
+                for key, value in samples:
+                    key = tuple(key)
+                    values[key] = metric._add(values[key], value) if key in values else value
+        return merged
+
+    def _publish_quietly(self):
+        try:
+            self.publish()
+        except OSError:
+            pass
+
+    def _start_publisher(self):
+        def publish_forever():
+            while True:
+                time.sleep(self.publish_interval)
+                self._publish_quietly()
+
+        threading.Thread(target=publish_forever, name='metrics-publisher', daemon=True).start()
+
+    def _after_fork(self):
+        # The parent's publisher thread didn't survive the fork, and a lock it
+        # held at that moment never will be released here
+        for metric in self._metrics:
+            metric._lock = threading.Lock()
+        self._baseline = {
+            metric.name: metric.snapshot() for metric in self._metrics if metric.kind != 'gauge'
+        }
+        self._start_publisher()
+
+
+REGISTRY = Registry(os.environ.get('METRICS_DIR') or None)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
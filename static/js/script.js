@@ -1,6 +1,17 @@
+const GAME_POLL_INTERVAL = 60 * 1000;  // ms; the server revalidates with ETags
+
 function loadData() {
-    const scheduleDiv = document.getElementById('schedule');
+    // The push feed is opt-in on the server (GAME_STREAM); poll by default
+    if (document.body.dataset.gameStream === 'true' && window.EventSource) {
+        subscribeToGames();
+        return;
+    }
     
+    pollGames();
+    setInterval(pollGames, GAME_POLL_INTERVAL);
+}
+
+function pollGames() {
     // Fetch today's games
     fetch('/todays_games')
         .then(response => response.json())
@@ -14,6 +25,37 @@ function loadData() {
         .catch(error => console.error('Error:', error));
 }
 
+function subscribeToGames() {
+    const source = new EventSource('/stream/games');
+    let date = '';
+    let games = {};
+    
+    const render = () => {
+        const ordered = Object.values(games).sort((a, b) => a.start - b.start);
+        displayGames({ date: date, games: ordered });
+    };
+    
+    source.addEventListener('snapshot', event => {
+        const snapshot = JSON.parse(event.data);
+        date = snapshot.date;
+        games = {};
+        snapshot.games.forEach(game => { games[game.id] = game; });
+        render();
+    });
+    
+    source.addEventListener('update', event => {
+        const diff = JSON.parse(event.data);
+        diff.removed.forEach(id => { delete games[id]; });
+        diff.added.forEach(game => { games[game.id] = game; });
+        diff.started.forEach(id => {
+            if (games[id]) {
+                games[id].started = true;
+            }
+        });
+        render();
+    });
+}
+
 function displayGames(data) {
     const scheduleDiv = document.getElementById('schedule');
     
@@ -44,13 +86,13 @@ function displayGames(data) {
         // Countdown cell
         const countdownCell = document.createElement('td');
         countdownCell.className = 'countdown';
-        countdownCell.dataset.startTime = game.datetime;
+        countdownCell.dataset.start = game.start;
         row.appendChild(countdownCell);
         
         // Teams cell
         const teamsCell = document.createElement('td');
         teamsCell.className = 'teams';
-        teamsCell.textContent = game.teams;
+        teamsCell.textContent = `${game.away_team} @ ${game.home_team}`;
         row.appendChild(teamsCell);
         
         // Arena cell
@@ -76,7 +118,7 @@ function displayGames(data) {
 
 function updateCountdowns() {
     document.querySelectorAll('.countdown').forEach(countdown => {
-        const startTime = new Date(countdown.dataset.startTime);
+        const startTime = new Date(Number(countdown.dataset.start) * 1000);
         const now = new Date();
         const diff = startTime - now;
         
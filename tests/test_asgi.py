@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import app as certe
+import asgi
+
+class Request:
+    """One GET request driven through an ASGI app, the way a server would."""
+
+    def __init__(self, path):
+        self.scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+            'query_string': b'', 'root_path': '', 'headers': [(b'host', b'testserver')],
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80)
+        }
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self._body_sent = False
+
+    async def receive(self):
+        if not self._body_sent:
+            self._body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        await self.messages.put(message)
+
+    async def run(self, application=None):
+        await (application or asgi.app)(self.scope, self.receive, self.send)
+
+    async def status(self):
+        return (await asyncio.wait_for(self.messages.get(), 5))['status']
+
+    async def chunk(self):
+        return (await asyncio.wait_for(self.messages.get(), 5))['body']
+
+class TestAsgiConcurrency(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        patcher = mock.patch.object(certe, 'GAME_STREAM', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def assert_todays_games_responds(self):
+        games = Request('/todays_games')
+        await asyncio.wait_for(games.run(), 5)
+        self.assertEqual(await games.status(), 200)
+
+    async def test_request_completes_while_stream_is_open(self):
+        stream = Request('/stream/games')
+        task = asyncio.create_task(stream.run())
+        self.assertEqual(await stream.status(), 200)
+        self.assertIn(b'event: snapshot', await stream.chunk())
+
+        await self.assert_todays_games_responds()
+        stream.disconnected.set()
+        task.cancel()
+
+    async def test_request_completes_while_wsgi_stream_holds_a_thread(self):
+        # The Flask stream route keeps its thread until the stream ends; other
+        # requests must still get a thread of their own
+        release = threading.Event()
+
+        def subscribe(max_seconds):
+            yield ': open\n\n'
+            release.wait(10)
+
+        with mock.patch.object(certe.game_feed, 'subscribe', subscribe):
+            stream = Request('/stream/games')
+            task = asyncio.create_task(stream.run(asgi.wsgi_app))
+            self.assertEqual(await stream.status(), 200)
+            self.assertEqual(await stream.chunk(), b': open\n\n')
+
+            try:
+                await self.assert_todays_games_responds()
+            finally:
+                release.set()
+                stream.disconnected.set()
+                await asyncio.wait_for(task, 5)
+
+if __name__ == '__main__':
+    unittest.main()
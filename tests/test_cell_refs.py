@@ -0,0 +1,79 @@
+import unittest
+
+from cell_refs import (CellRange, MAX_COLS, MAX_ROWS, column_letters, parse_cell_reference,
+                       parse_cell_references, parse_range)
+
+class TestParseCellReference(unittest.TestCase):
+    def test_zero_based_row_and_column(self):
+        self.assertEqual(parse_cell_reference('A1'), (0, 0))
+        self.assertEqual(parse_cell_reference('G1'), (0, 6))
+        self.assertEqual(parse_cell_reference('AA10'), (9, 26))
+
+    def test_lowercase_absolute_and_padded(self):
+        self.assertEqual(parse_cell_reference('k5'), (4, 10))
+        self.assertEqual(parse_cell_reference('$K$5'), (4, 10))
+        self.assertEqual(parse_cell_reference(' k5 '), (4, 10))
+
+    def test_limits(self):
+        last_col = column_letters(MAX_COLS - 1)
+        self.assertEqual(parse_cell_reference(f'{last_col}{MAX_ROWS}'), (MAX_ROWS - 1, MAX_COLS - 1))
+
+    def test_invalid_references(self):
+        for ref in ['', 'A', '1', 'A0', '1A', 'A1B', 'AAAA1', 'A-1', 'A1:B2', 'Sheet1!A1',
+                    f'A{MAX_ROWS + 1}', 'XFE1']:
+            with self.subTest(ref=ref):
+                with self.assertRaises(ValueError):
+                    parse_cell_reference(ref)
+
+class TestParseCellReferences(unittest.TestCase):
+    def test_lists_become_row_and_column_arrays(self):
+        rows, cols = parse_cell_references(['A1', 'g1', '$AA$10'])
+
+        self.assertEqual(rows.tolist(), [0, 0, 9])
+        self.assertEqual(cols.tolist(), [0, 6, 26])
+        self.assertEqual(rows.dtype.kind, 'i')
+
+    def test_empty_list(self):
+        rows, cols = parse_cell_references([])
+
+        self.assertEqual((rows.shape, cols.shape), ((0,), (0,)))
+
+    def test_any_invalid_reference_fails_the_list(self):
+        with self.assertRaises(ValueError):
+            parse_cell_references(['A1', 'A0'])
+
+class TestParseRange(unittest.TestCase):
+    def test_range(self):
+        self.assertEqual(parse_range('G1:K5'), CellRange(None, 0, 6, 4, 10))
+
+    def test_single_cell_is_one_cell_range(self):
+        self.assertEqual(parse_range('b3'), CellRange(None, 2, 1, 2, 1))
+
+    def test_lowercase(self):
+        self.assertEqual(parse_range('g1:k5'), parse_range('G1:K5'))
+        self.assertEqual(parse_range('g:k'), parse_range('G:K'))
+
+    def test_reversed_ranges_are_normalized(self):
+        self.assertEqual(parse_range('K5:G1'), CellRange(None, 0, 6, 4, 10))
+        # Corners given as top-right and bottom-left
+        self.assertEqual(parse_range('K1:G5'), CellRange(None, 0, 6, 4, 10))
+        self.assertEqual(parse_range('K:G'), CellRange(None, 0, 6, None, 10))
+
+    def test_whole_columns(self):
+        self.assertEqual(parse_range('G:K'), CellRange(None, 0, 6, None, 10))
+        self.assertEqual(parse_range('$C:$C'), CellRange(None, 0, 2, None, 2))
+        self.assertEqual(parse_range('C'), CellRange(None, 0, 2, None, 2))
+
+    def test_sheet_qualified(self):
+        self.assertEqual(parse_range('Sheet2!A1'), CellRange('Sheet2', 0, 0, 0, 0))
+        self.assertEqual(parse_range("'My Sheet'!G1:K5"), CellRange('My Sheet', 0, 6, 4, 10))
+        self.assertEqual(parse_range("'It''s'!A:B"), CellRange("It's", 0, 0, None, 1))
+
+    def test_invalid_ranges(self):
+        for ref in ['', ':', 'A1:', ':B2', 'A1:B', 'A:B2', 'A1:B2:C3', '!A1', 'A0:B2', 'XFE:XFF']:
+            with self.subTest(ref=ref):
+                with self.assertRaises(ValueError):
+                    parse_range(ref)
+
+if __name__ == '__main__':
+    unittest.main()
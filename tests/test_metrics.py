@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+from metrics import Registry
+
+def samples(text):
+    return {line.rsplit(' ', 1)[0]: line.rsplit(' ', 1)[1]
+            for line in text.splitlines() if not line.startswith('#')}
+
+class TestRegistry(unittest.TestCase):
+    def test_process_local_render(self):
+        registry = Registry()
+        requests = registry.counter('requests_total', 'Requests.', ['route'])
+        latency = registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        requests.inc(route='/a')
+        requests.inc(2, route='/a')
+        latency.observe(0.05)
+        latency.observe(0.5)
+
+        rendered = samples(registry.render())
+
+        self.assertEqual(rendered['requests_total{route="/a"}'], '3')
+        self.assertEqual(rendered['latency_seconds_bucket{le="0.1"}'], '1')
+        self.assertEqual(rendered['latency_seconds_bucket{le="+Inf"}'], '2')
+        self.assertEqual(rendered['latency_seconds_count'], '2')
+
+class TestSharedRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.registry = Registry(self.tmp.name, publish_interval=3600)
+        self.requests = self.registry.counter('requests_total', 'Requests.', ['route'])
+        self.latency = self.registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        self.cache_bytes = self.registry.gauge('cache_bytes', 'Cache size.')
+
+    def run_in_child(self, record):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                record()
+                self.registry.publish()
+            finally:
+                os._exit(0)
+        os.waitpid(pid, 0)
+        return pid
+
+    def test_values_are_summed_across_processes(self):
+        # Recorded before the fork: inherited by the child but counted once
+        self.requests.inc(route='/a')
+        self.latency.observe(0.05)
+
+        def record():
+            self.requests.inc(2, route='/a')
+            self.requests.inc(route='/b')
+            self.latency.observe(0.5)
+
+        self.run_in_child(record)
+        self.registry.publish()
+        rendered = samples(self.registry.render())
+
+        self.assertEqual(rendered['requests_total{route="/a"}'], '3')
+        self.assertEqual(rendered['requests_total{route="/b"}'], '1')
+        self.assertEqual(rendered['latency_seconds_bucket{le="0.1"}'], '1')
+        self.assertEqual(rendered['latency_seconds_bucket{le="1.0"}'], '2')
+        self.assertEqual(rendered['latency_seconds_count'], '2')
+
+    def test_gauges_are_reported_per_live_process(self):
+        self.cache_bytes.set(100)
+        child = self.run_in_child(lambda: self.cache_bytes.set(7))
+        self.registry.publish()
+
+        rendered = samples(self.registry.render())
+
+        self.assertEqual(rendered[f'cache_bytes{{pid="{os.getpid()}"}}'], '100')
+        self.assertNotIn(f'cache_bytes{{pid="{child}"}}', rendered)
+
+    def test_render_reports_published_values(self):
+        self.requests.inc(route='/a')
+        self.registry.publish()
+        self.requests.inc(route='/a')
+
+        self.assertEqual(samples(self.registry.render())['requests_total{route="/a"}'], '1')
+
+    def test_unreadable_files_are_skipped(self):
+        with open(os.path.join(self.tmp.name, '1.json'), 'w') as f:
+            f.write('{"requests_total": [')
+        self.requests.inc(route='/a')
+        self.registry.publish()
+
+        self.assertEqual(samples(self.registry.render())['requests_total{route="/a"}'], '1')
+
+if __name__ == '__main__':
+    unittest.main()
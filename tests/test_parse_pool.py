@@ -0,0 +1,59 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import app as certe
+
+class TestParsePool(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(certe, 'PARSE_TIMEOUT', 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def wait_for_free_slots(self):
+        deadline = time.monotonic() + 10
+        while certe._parse_slots._value < certe.PARSE_QUEUE_LIMIT:
+            self.assertLess(time.monotonic(), deadline, 'parse slots were never released')
+            time.sleep(0.05)
+
+    def test_timed_out_parse_is_killed(self):
+        executor = certe.get_parse_executor()
+        executor.submit(abs, 0).result(timeout=30)  # start the processes
+        processes = list(executor._processes.values())
+
+        started = time.monotonic()
+        with self.assertRaises(certe.ParserBusy):
+            certe.submit_parse(time.sleep, 60)
+
+        self.assertLess(time.monotonic() - started, 10)
+        for process in processes:
+            process.join(10)
+            self.assertFalse(process.is_alive())
+        self.wait_for_free_slots()
+        self.assertIsNot(certe.get_parse_executor(), executor)
+
+    def test_pool_serves_parses_after_a_timeout(self):
+        with self.assertRaises(certe.ParserBusy):
+            certe.submit_parse(time.sleep, 60)
+
+        self.assertEqual(certe.submit_parse(abs, -3), 3)
+        self.wait_for_free_slots()
+
+    def test_parse_killed_by_another_timeout_is_retried(self):
+        certe.get_parse_executor().submit(abs, 0).result(timeout=30)
+        runaway = threading.Thread(
+            target=lambda: self.assertRaises(certe.ParserBusy, certe.submit_parse, time.sleep, 60))
+        runaway.start()
+        time.sleep(0.8)
+        # Still running when the runaway parse times out and its pool is killed
+        with mock.patch.object(certe, '_admit_parse', wraps=certe._admit_parse) as admit:
+            result = certe.submit_parse(time.sleep, 0.4)
+        runaway.join()
+
+        self.assertIsNone(result)
+        self.assertEqual(admit.call_count, 2)
+        self.wait_for_free_slots()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from app import _request_range, _request_ranges
+from cell_refs import CellRange
+
+class TestRequestRanges(unittest.TestCase):
+    def test_matches_one_by_one_parsing(self):
+        items = [
+            {'start_cell': 'G1', 'end_cell': 'K5'},
+            {'range': 'A:C'},
+            {'start_cell': 'K5', 'end_cell': 'G1', 'sheet': 'Schedule'},
+            {'range': "'My Sheet'!B2"},
+            {'range': 'A1:B2', 'sheet': '2'},
+            {},
+        ]
+
+        self.assertEqual(_request_ranges(items), [_request_range(item) for item in items])
+
+    def test_corners_are_ordered(self):
+        self.assertEqual(_request_ranges([{'start_cell': 'K1', 'end_cell': 'G5'}]),
+                         [CellRange(None, 0, 6, 4, 10)])
+
+    def test_ranges_only(self):
+        self.assertEqual(_request_ranges([{'range': 'B3'}]), [CellRange(None, 2, 1, 2, 1)])
+
+    def test_invalid_reference(self):
+        with self.assertRaises(ValueError):
+            _request_ranges([{'start_cell': 'A1', 'end_cell': 'B2'}, {'start_cell': 'A0'}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from unittest import mock
+
+import app as certe
+
+class TestScheduleRevalidation(unittest.TestCase):
+    def setUp(self):
+        self.client = certe.app.test_client()
+
+    def test_poll_a_minute_later_is_not_modified(self):
+        first = self.client.get('/todays_games')
+        later = certe.time.time() + 60
+        with mock.patch.object(certe.time, 'time', return_value=later):
+            second = self.client.get('/todays_games',
+                                     headers={'If-None-Match': first.headers['ETag']})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+        self.assertIn('no-cache', first.headers['Cache-Control'])
+
+    def test_games_carry_start_epochs_not_countdowns(self):
+        game_day = next(iter(certe.season_schedule._current()[1].values()))
+        # Swapping the day behind an unchanged ETag; don't serve the cached body
+        with mock.patch.object(certe.season_schedule, 'day', return_value=game_day), \
+                mock.patch.object(certe, 'encoded_bodies', certe.EncodedBodyCache(1, 0)):
+            games = self.client.get('/todays_games').get_json()['games']
+
+        self.assertEqual(len(games), len(game_day.games))
+        for game in games:
+            self.assertIsInstance(game['start'], int)
+            self.assertNotIn('countdown', game)
+
+    def test_last_modified_is_never_in_the_future(self):
+        response = self.client.get('/todays_games')
+
+        self.assertLessEqual(response.last_modified.timestamp(), certe.time.time())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import stat
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from app import SNAPSHOT_MODE, Game, ScheduleStore, read_schedule_snapshot, write_schedule_snapshot
+
+GAMES = [
+    Game(datetime(2025, 1, 15, 19, 30), 'NYK', 'MIA', 'Kaseya Center', '7:30p'),
+    Game(datetime(2025, 1, 15, 22, 0), 'LAL', 'BOS', 'TD Garden', '10:00p'),
+]
+FINGERPRINT = (1_700_000_000_123_456_789, 4096)
+
+class TestScheduleSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'schedule.xlsx.npz')
+
+    def test_round_trip(self):
+        write_schedule_snapshot(self.path, GAMES, FINGERPRINT)
+
+        self.assertEqual(read_schedule_snapshot(self.path, FINGERPRINT), GAMES)
+
+    def test_empty_schedule_round_trips(self):
+        write_schedule_snapshot(self.path, [], FINGERPRINT)
+
+        self.assertEqual(read_schedule_snapshot(self.path, FINGERPRINT), [])
+
+    def test_snapshot_of_another_workbook_version_is_stale(self):
+        write_schedule_snapshot(self.path, GAMES, FINGERPRINT)
+
+        self.assertIsNone(read_schedule_snapshot(self.path, (FINGERPRINT[0] + 1, FINGERPRINT[1])))
+        self.assertIsNone(read_schedule_snapshot(self.path, (FINGERPRINT[0], FINGERPRINT[1] + 1)))
+
+    def test_missing_or_unreadable_snapshot_is_ignored(self):
+        self.assertIsNone(read_schedule_snapshot(self.path, FINGERPRINT))
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot')
+        self.assertIsNone(read_schedule_snapshot(self.path, FINGERPRINT))
+
+    def test_truncated_snapshot_is_ignored(self):
+        write_schedule_snapshot(self.path, GAMES, FINGERPRINT)
+        with open(self.path, 'rb') as f:
+            content = f.read()
+        with open(self.path, 'wb') as f:
+            f.write(content[:len(content) // 2])
+
+        self.assertIsNone(read_schedule_snapshot(self.path, FINGERPRINT))
+
+    def test_snapshot_mode(self):
+        write_schedule_snapshot(self.path, GAMES, FINGERPRINT)
+
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), SNAPSHOT_MODE)
+
+    def test_failed_write_leaves_no_files_behind(self):
+        with mock.patch('app.np.savez', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                write_schedule_snapshot(self.path, GAMES, FINGERPRINT)
+
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_failed_rename_keeps_the_previous_snapshot(self):
+        write_schedule_snapshot(self.path, GAMES, FINGERPRINT)
+
+        with mock.patch('app.os.replace', side_effect=OSError('read-only')):
+            with self.assertRaises(OSError):
+                write_schedule_snapshot(self.path, GAMES[:1], (1, 1))
+
+        self.assertEqual(os.listdir(self.tmp.name), ['schedule.xlsx.npz'])
+        self.assertEqual(read_schedule_snapshot(self.path, FINGERPRINT), GAMES)
+
+class TestScheduleStoreSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'schedule.xlsx')
+        with open(self.path, 'w') as f:
+            f.write('workbook')
+        self.calls = 0
+
+    def loader(self, path):
+        self.calls += 1
+        return GAMES
+
+    def test_second_store_reads_the_snapshot_instead_of_the_workbook(self):
+        ScheduleStore(self.path, self.loader).preload()
+        store = ScheduleStore(self.path, self.loader)
+        store.preload()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(list(store.games_on(GAMES[0].start.date())), GAMES)
+
+    def test_changed_workbook_rebuilds_the_snapshot(self):
+        ScheduleStore(self.path, self.loader).preload()
+        with open(self.path, 'a') as f:
+            f.write(' edited')
+        ScheduleStore(self.path, self.loader).preload()
+
+        self.assertEqual(self.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from app import ET, Game, ScheduleStore
+
+class JsonScheduleLoader:
+    """Stands in for the Excel loaders: games stored as JSON rows, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, path):
+        self.calls += 1
+        with open(path) as f:
+            rows = json.load(f)
+        return [Game(datetime.fromisoformat(start), away, home, '', label)
+                for start, away, home, label in rows]
+
+class TestScheduleStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, 'schedule.xlsx')
+        self.loader = JsonScheduleLoader()
+        self.write_schedule([
+            ('2025-01-15T22:00:00', 'LAL', 'BOS', '10:00p'),
+            ('2025-01-15T19:30:00', 'NYK', 'MIA', '7:30p'),
+            ('2025-01-16T19:00:00', 'GSW', 'DEN', '7:00p'),
+        ], mtime_ns=1_000_000_000)
+
+    def write_schedule(self, rows, mtime_ns):
+        with open(self.path, 'w') as f:
+            json.dump(rows, f)
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_games_are_indexed_by_day_in_start_order(self):
+        store = ScheduleStore(self.path, self.loader, ET)
+
+        day = store.day(date(2025, 1, 15))
+
+        self.assertEqual([game.away_team for game in day.games], ['NYK', 'LAL'])
+        # 7:30pm EST is 00:30 UTC the next day
+        self.assertEqual(day.starts.tolist(), [1736987400, 1736996400])
+        self.assertEqual(len(store.games_on(date(2025, 1, 16))), 1)
+        self.assertEqual(store.games_on(date(2025, 1, 17)), ())
+
+    def test_daylight_saving_offsets_come_from_the_date(self):
+        self.write_schedule([('2025-07-04T19:00:00', 'A', 'B', '7:00p')], mtime_ns=2_000_000_000)
+        store = ScheduleStore(self.path, self.loader, ET)
+
+        # 7:00pm EDT is 23:00 UTC
+        self.assertEqual(store.day(date(2025, 7, 4)).starts.tolist(), [1751670000])
+
+    def test_unchanged_file_is_loaded_once(self):
+        store = ScheduleStore(self.path, self.loader, ET)
+        store.day(date(2025, 1, 15))
+        store.day(date(2025, 1, 16))
+
+        self.assertEqual(self.loader.calls, 1)
+        self.assertEqual(store.fingerprint(), (1_000_000_000, os.path.getsize(self.path)))
+
+    def test_changed_file_is_reloaded_on_read(self):
+        store = ScheduleStore(self.path, self.loader, ET)
+        store.day(date(2025, 1, 15))
+
+        self.write_schedule([('2025-01-15T20:00:00', 'PHX', 'SAC', '8:00p')], mtime_ns=2_000_000_000)
+
+        self.assertEqual([game.away_team for game in store.games_on(date(2025, 1, 15))], ['PHX'])
+        self.assertEqual(self.loader.calls, 2)
+
+    def test_watched_store_only_changes_on_reload(self):
+        store = ScheduleStore(self.path, self.loader, ET)
+        store.preload()
+        store.watched = True
+
+        self.write_schedule([('2025-01-15T20:00:00', 'PHX', 'SAC', '8:00p')], mtime_ns=2_000_000_000)
+        before = store.games_on(date(2025, 1, 15))
+        store.reload()
+        after = store.games_on(date(2025, 1, 15))
+
+        self.assertEqual([game.away_team for game in before], ['NYK', 'LAL'])
+        self.assertEqual([game.away_team for game in after], ['PHX'])
+
+    def test_failed_reload_keeps_the_loaded_schedule(self):
+        store = ScheduleStore(self.path, self.loader, ET)
+        store.preload()
+        store.watched = True
+
+        with open(self.path, 'w') as f:
+            f.write('not json')
+        os.utime(self.path, ns=(2_000_000_000, 2_000_000_000))
+        store.reload()
+
+        self.assertEqual(len(store.games_on(date(2025, 1, 15))), 2)
+
+if __name__ == '__main__':
+    unittest.main()
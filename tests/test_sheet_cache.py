@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app import SheetCache, _estimate_grid_bytes
+
+class CountingLoader:
+    """Stands in for load_sheet_grid: a grid named after the file, counting calls."""
+
+    def __init__(self, rows=10):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, filepath, sheet):
+        self.calls.append((os.path.basename(filepath), sheet))
+        with open(filepath) as f:
+            content = f.read()
+        return [[content, row] for row in range(self.rows)]
+
+class TestSheetCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.loader = CountingLoader()
+
+    def workbook(self, name, content='v1', mtime_ns=None):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def grid_bytes(self):
+        return _estimate_grid_bytes(self.loader(self.workbook('probe.xlsx'), None))
+
+    def test_repeat_reads_are_served_from_cache(self):
+        cache = SheetCache(10 ** 6)
+        path = self.workbook('a.xlsx')
+
+        first = cache.get_or_load(path, self.loader)
+        second = cache.get_or_load(path, self.loader)
+
+        self.assertIs(first, second)
+        self.assertEqual(self.loader.calls, [('a.xlsx', None)])
+
+    def test_sheets_are_cached_separately(self):
+        cache = SheetCache(10 ** 6)
+        path = self.workbook('a.xlsx')
+
+        cache.get_or_load(path, self.loader, 'Sheet1')
+        cache.get_or_load(path, self.loader, 'Sheet2')
+        cache.get_or_load(path, self.loader, 'Sheet1')
+
+        self.assertEqual(self.loader.calls, [('a.xlsx', 'Sheet1'), ('a.xlsx', 'Sheet2')])
+        self.assertEqual(cache.cached_sheets(path), {'Sheet1', 'Sheet2'})
+
+    def test_changed_file_is_decoded_again(self):
+        cache = SheetCache(10 ** 6)
+        path = self.workbook('a.xlsx', 'v1', mtime_ns=1_000_000_000)
+        cache.get_or_load(path, self.loader)
+
+        self.workbook('a.xlsx', 'v2', mtime_ns=2_000_000_000)
+        grid = cache.get_or_load(path, self.loader)
+
+        self.assertEqual(grid[0][0], 'v2')
+        self.assertEqual(len(self.loader.calls), 2)
+        # The grid of the old version is dropped, not kept alongside
+        self.assertEqual(len(cache._entries), 1)
+
+    def test_least_recently_used_grid_is_evicted_over_budget(self):
+        cache = SheetCache(self.grid_bytes() * 2 + 1)
+        self.loader.calls.clear()
+        a, b, c = (self.workbook(name) for name in ('a.xlsx', 'b.xlsx', 'c.xlsx'))
+
+        cache.get_or_load(a, self.loader)
+        cache.get_or_load(b, self.loader)
+        cache.get_or_load(a, self.loader)  # a is now the most recently used
+        cache.get_or_load(c, self.loader)  # over budget: evicts b
+        cache.get_or_load(a, self.loader)
+        cache.get_or_load(b, self.loader)
+
+        self.assertEqual([name for name, _ in self.loader.calls],
+                         ['a.xlsx', 'b.xlsx', 'c.xlsx', 'b.xlsx'])
+        self.assertLessEqual(cache._size, cache.max_bytes)
+
+    def test_single_grid_larger_than_budget_is_still_cached(self):
+        cache = SheetCache(1)
+        path = self.workbook('a.xlsx')
+
+        cache.get_or_load(path, self.loader)
+        cache.get_or_load(path, self.loader)
+
+        self.assertEqual(len(self.loader.calls), 1)
+
+    def test_watched_reads_serve_the_cached_grid_until_refreshed(self):
+        cache = SheetCache(10 ** 6)
+        path = self.workbook('a.xlsx', 'v1', mtime_ns=1_000_000_000)
+        cache.get_or_load(path, self.loader)
+        cache.watched_directories = frozenset([self.tmp.name])
+
+        # A write the watcher hasn't settled on yet
+        self.workbook('a.xlsx', 'v2 (partial', mtime_ns=2_000_000_000)
+        with mock.patch('app.os.stat', side_effect=AssertionError('stat on a watched read')):
+            during = cache.get_or_load(path, self.loader)
+        after = cache.get_or_load(path, self.loader, refresh=True)
+
+        self.assertEqual(during[0][0], 'v1')
+        self.assertEqual(after[0][0], 'v2 (partial')
+        self.assertIs(cache.get_or_load(path, self.loader), after)
+        self.assertEqual(len(self.loader.calls), 2)
+
+    def test_watched_reads_of_uncached_sheets_still_load(self):
+        cache = SheetCache(10 ** 6)
+        cache.watched_directories = frozenset([self.tmp.name])
+        path = self.workbook('a.xlsx')
+
+        cache.get_or_load(path, self.loader)
+        cache.get_or_load(path, self.loader)
+
+        self.assertEqual(len(self.loader.calls), 1)
+
+    def test_unwatched_directories_are_still_checked(self):
+        cache = SheetCache(10 ** 6)
+        cache.watched_directories = frozenset([os.path.join(self.tmp.name, 'other')])
+        path = self.workbook('a.xlsx', 'v1', mtime_ns=1_000_000_000)
+        cache.get_or_load(path, self.loader)
+
+        self.workbook('a.xlsx', 'v2', mtime_ns=2_000_000_000)
+
+        self.assertEqual(cache.get_or_load(path, self.loader)[0][0], 'v2')
+
+    def test_discard_drops_every_sheet_of_a_file(self):
+        cache = SheetCache(10 ** 6)
+        a, b = self.workbook('a.xlsx'), self.workbook('b.xlsx')
+        for sheet in ('Sheet1', 'Sheet2'):
+            cache.get_or_load(a, self.loader, sheet)
+        cache.get_or_load(b, self.loader)
+
+        cache.discard(a)
+
+        self.assertEqual(cache.cached_sheets(a), set())
+        self.assertEqual(cache.cached_paths(), {os.path.abspath(b)})
+        self.assertEqual(cache._size, sum(entry[1] for entry in cache._entries.values()))
+
+if __name__ == '__main__':
+    unittest.main()